@@ -0,0 +1,75 @@
+"""Regression tests for the engine's symmetry keys and incremental evaluation"""
+import random
+import unittest
+
+from tic_tac_toe_engine import GameState, board_config
+
+CONFIGS = [(3, 3), (4, 4), (5, 4), (7, 5), (15, 5)]
+
+
+def reference_score(config, x, o):
+    """Line-weight evaluation from X's point of view, recomputed from scratch"""
+    score = 0
+    for line in config.win_lines:
+        xs = sum(x >> cell & 1 for cell in line)
+        os = sum(o >> cell & 1 for cell in line)
+        if xs and not os:
+            score += 10 ** (xs - 1)
+        elif os and not xs:
+            score -= 10 ** (os - 1)
+    return score
+
+
+def random_position(config, rng, pieces):
+    """(x, o) masks with pieces cells filled alternately, X first"""
+    cells = rng.sample(range(config.cells), pieces)
+    x = sum(1 << cell for cell in cells[0::2])
+    o = sum(1 << cell for cell in cells[1::2])
+    return x, o
+
+
+class CanonicalKeyTest(unittest.TestCase):
+
+    def test_invariant_under_symmetries(self):
+        rng = random.Random(3)
+        for size, win_length in CONFIGS:
+            config = board_config(size, win_length)
+            if config.symmetry_chunks is None:
+                continue
+            maps = config.symmetries()
+            for _ in range(50):
+                me, opp = random_position(config, rng, rng.randint(0, min(config.cells, 12)))
+                key = config.canonical_key(me, opp)
+                for cells in maps:
+                    image_me = sum(1 << cells[cell] for cell in range(config.cells) if me >> cell & 1)
+                    image_opp = sum(1 << cells[cell] for cell in range(config.cells) if opp >> cell & 1)
+                    self.assertEqual(config.canonical_key(image_me, image_opp), key,
+                                     (config, me, opp))
+
+    def test_distinct_classes_get_distinct_keys(self):
+        config = board_config(3, 3)
+        # Corner, edge and center openings are the three classes for X's first move
+        keys = {config.canonical_key(1 << cell, 0) for cell in range(9)}
+        self.assertEqual(len(keys), 3)
+
+
+class GameStateScoreTest(unittest.TestCase):
+
+    def test_score_matches_full_evaluation(self):
+        rng = random.Random(5)
+        for size, win_length in CONFIGS:
+            config = board_config(size, win_length)
+            for _ in range(10):
+                state = GameState(config)
+                moves = rng.sample(range(config.cells), min(config.cells, 30))
+                for move in moves:
+                    state.make(move)
+                    self.assertEqual(state.score, reference_score(config, state.x, state.o))
+                while state.history:
+                    state.unmake()
+                    self.assertEqual(state.score, reference_score(config, state.x, state.o))
+                self.assertEqual(state.score, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
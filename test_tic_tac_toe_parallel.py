@@ -0,0 +1,49 @@
+"""Regression tests: the parallel search picks the serial search's move"""
+import unittest
+
+from tic_tac_toe_engine import TicTacToeEngine, board_config
+from tic_tac_toe_parallel import ParallelSearch
+
+# (size, win_length, opening moves, depth)
+POSITIONS = [
+    (3, 3, [], 9),
+    (3, 3, [0], 8),
+    (3, 3, [4, 0], 7),
+    (4, 4, [], 4),
+    (4, 4, [5, 0], 4),
+    (5, 4, [12], 3),
+]
+
+
+def engine_at(size, win_length, opening):
+    engine = TicTacToeEngine(board_config(size, win_length))
+    for move in opening:
+        engine.play(move)
+    return engine
+
+
+class ParallelSearchTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ParallelSearch(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_best_move_matches_serial(self):
+        for size, win_length, opening, depth in POSITIONS:
+            serial = engine_at(size, win_length, opening).get_best_move(depth)
+            result = self.pool.best_move(engine_at(size, win_length, opening), depth)
+            self.assertEqual(result.move, serial, (size, win_length, opening))
+
+    def test_single_worker_runs_in_process(self):
+        with ParallelSearch(1) as pool:
+            result = pool.best_move(engine_at(3, 3, [4]), 8)
+        self.assertEqual(result.move, engine_at(3, 3, [4]).get_best_move(8))
+        self.assertIsNone(pool.pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
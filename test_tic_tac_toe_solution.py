@@ -0,0 +1,87 @@
+"""Regression tests for the 3x3 perfect-play table"""
+import functools
+import unittest
+
+from tic_tac_toe_solution import PerfectPlayTable, encode_table, solve_all
+
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+
+def won(cells):
+    return any(all(cell in cells for cell in line) for line in LINES)
+
+
+@functools.lru_cache(maxsize=None)
+def minimax(me, opp):
+    """Depth-aware score for the side to move: sooner wins and later losses score higher"""
+    empty = [cell for cell in range(9) if cell not in me and cell not in opp]
+    best = None
+    for move in empty:
+        placed = me | {move}
+        if won(placed):
+            score = 10
+        elif len(empty) == 1:
+            score = 0
+        else:
+            score = -minimax(opp, placed)
+            score -= (score > 0) - (score < 0)
+        best = score if best is None else max(best, score)
+    return best if best is not None else 0
+
+
+def reachable():
+    """Every non-terminal position reachable from the empty board, as (x, o) cell sets"""
+    seen = set()
+    stack = [(frozenset(), frozenset())]
+    while stack:
+        x, o = stack.pop()
+        if (x, o) in seen or won(x) or won(o) or len(x) + len(o) == 9:
+            continue
+        seen.add((x, o))
+        for cell in range(9):
+            if cell not in x and cell not in o:
+                stack.append((x | {cell}, o) if len(x) == len(o) else (x, o | {cell}))
+    return seen
+
+
+def mask(cells):
+    return sum(1 << cell for cell in cells)
+
+
+class PerfectPlayTableTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = PerfectPlayTable(encode_table(solve_all()))
+
+    def test_matches_brute_force_minimax(self):
+        positions = reachable()
+        self.assertEqual(len(positions), 4520)
+        for x, o in positions:
+            me, opp = (x, o) if len(x) == len(o) else (o, x)
+            best = minimax(me, opp)
+            moves = set()
+            for move in range(9):
+                if move in x or move in o:
+                    continue
+                placed = me | {move}
+                if won(placed):
+                    score = 10
+                elif len(placed) + len(opp) == 9:
+                    score = 0
+                else:
+                    score = -minimax(opp, placed)
+                    score -= (score > 0) - (score < 0)
+                if score == best:
+                    moves.add(move)
+            value, table_moves = self.table.lookup(mask(x), mask(o))
+            self.assertEqual(value, (best > 0) - (best < 0), (sorted(x), sorted(o)))
+            self.assertEqual(set(table_moves), moves, (sorted(x), sorted(o)))
+
+    def test_unreachable_positions_are_missing(self):
+        # Two X pieces and no O can't happen with X moving first
+        self.assertIsNone(self.table.lookup(0b11, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
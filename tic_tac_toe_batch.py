@@ -0,0 +1,189 @@
+"""Vectorized classification of many boards at once.
+
+Boards are rows of an (N, cells) integer array holding 0 for an empty
+cell, 1 for X and 2 for O (the base-3 digits of tic_tac_toe_solution).
+Winners come from reductions over a (lines, win_length) matrix of cell
+indices, so a million boards cost a handful of NumPy operations rather
+than a million calls into the engine:
+
+    python tic_tac_toe_batch.py --boards 1000000
+
+Needs NumPy; the rest of the game does not.
+"""
+import argparse
+import functools
+import sys
+import time
+
+import numpy as np
+
+from tic_tac_toe_engine import CLASSIC, PLAYER_O, PLAYER_X, Bitboard, board_config
+
+CELL_EMPTY = 0
+CELL_X = 1
+CELL_O = 2
+
+# Result codes returned by winners()
+IN_PROGRESS = 0
+X_WINS = 1
+O_WINS = 2
+DRAW = 3
+RESULT_NAMES = ('in progress', 'X wins', 'O wins', 'draw')
+
+# Gathered line cells allowed per chunk; bounds memory on large boards
+CHUNK_ELEMENTS = 1 << 24
+
+# Byte -> cell code, for parsing 'XO..X...O' style board strings
+_CELL_CODES = np.zeros(256, dtype=np.uint8)
+_CELL_CODES[ord(PLAYER_X)] = CELL_X
+_CELL_CODES[ord(PLAYER_O)] = CELL_O
+
+
+@functools.lru_cache(maxsize=None)
+def win_line_matrix(config):
+    """(lines, win_length) array of the cell indices of every win line"""
+    return np.array(config.win_lines, dtype=np.intp)
+
+
+def as_boards(boards, config=CLASSIC):
+    """Validate boards as an (N, cells) uint8 array"""
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim != 2 or boards.shape[1] != config.cells:
+        raise ValueError(f"Expected an (N, {config.cells}) array of boards, got {boards.shape}")
+    return boards
+
+
+def parse_boards(strings, config=CLASSIC):
+    """Boards from strings of 'X', 'O' and anything else for empty"""
+    data = ''.join(strings).encode('ascii')
+    codes = _CELL_CODES[np.frombuffer(data, dtype=np.uint8)]
+    if codes.size != len(strings) * config.cells:
+        raise ValueError(f"Every board string must have {config.cells} cells")
+    return codes.reshape(len(strings), config.cells)
+
+
+def from_bitboards(positions, config=CLASSIC):
+    """Boards from a sequence of Bitboards (boards of up to 64 cells)"""
+    if config.cells > 64:
+        raise ValueError("Bitboard conversion only supports boards of up to 64 cells")
+    xs = np.array([position.x for position in positions], dtype=np.uint64)
+    os_ = np.array([position.o for position in positions], dtype=np.uint64)
+    shifts = np.arange(config.cells, dtype=np.uint64)
+    boards = ((xs[:, None] >> shifts) & 1).astype(np.uint8)
+    boards += ((os_[:, None] >> shifts) & 1).astype(np.uint8) * CELL_O
+    return boards
+
+
+def to_bitboards(boards, config=CLASSIC):
+    """Inverse of from_bitboards"""
+    boards = as_boards(boards, config)
+    return [Bitboard.from_cells([' XO'[cell] for cell in row], config) for row in boards.tolist()]
+
+
+def winners(boards, config=CLASSIC):
+    """Result code per board: IN_PROGRESS, X_WINS, O_WINS or DRAW.
+
+    Like Bitboard.winner(), X is reported if both sides have a line.
+    """
+    boards = as_boards(boards, config)
+    lines = win_line_matrix(config)
+    results = np.full(len(boards), IN_PROGRESS, dtype=np.int8)
+    if not len(lines):
+        return results
+
+    chunk = max(1, CHUNK_ELEMENTS // lines.size)
+    for start in range(0, len(boards), chunk):
+        gathered = boards[start:start + chunk][:, lines]
+        # A line is won when every cell holds the same piece; min == max
+        # over the line then equals that piece
+        low = gathered.min(axis=2)
+        full = low == gathered.max(axis=2)
+        x_won = (full & (low == CELL_X)).any(axis=1)
+        o_won = (full & (low == CELL_O)).any(axis=1)
+        part = results[start:start + chunk]
+        part[o_won] = O_WINS
+        part[x_won] = X_WINS
+
+    draws = (results == IN_PROGRESS) & (boards != CELL_EMPTY).all(axis=1)
+    results[draws] = DRAW
+    return results
+
+
+def legal_moves(boards, config=CLASSIC, results=None):
+    """(N, cells) bool array of legal moves; none once a game is over"""
+    boards = as_boards(boards, config)
+    if results is None:
+        results = winners(boards, config)
+    return (boards == CELL_EMPTY) & (results == IN_PROGRESS)[:, None]
+
+
+def legal_move_masks(boards, config=CLASSIC, results=None):
+    """Legal moves packed into uint64 masks, bit i for cell i like Bitboard"""
+    if config.cells > 64:
+        raise ValueError("Move masks only support boards of up to 64 cells; use legal_moves()")
+    moves = legal_moves(boards, config, results)
+    weights = np.left_shift(np.uint64(1), np.arange(config.cells, dtype=np.uint64))
+    return (moves * weights).sum(axis=1, dtype=np.uint64)
+
+
+def classify(boards, config=CLASSIC):
+    """Return (results, legal_moves) for a batch of boards.
+
+    legal_moves is packed into uint64 masks on boards of up to 64 cells
+    and is an (N, cells) bool array on larger ones.
+    """
+    boards = as_boards(boards, config)
+    results = winners(boards, config)
+    if config.cells > 64:
+        return results, legal_moves(boards, config, results)
+    return results, legal_move_masks(boards, config, results)
+
+
+def random_boards(count, config=CLASSIC, seed=None):
+    """Boards reached by random play, stopping after a random number of moves.
+
+    Play is not stopped at a win, so some boards hold lines for both sides.
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.random((count, config.cells)).argsort(axis=1)
+    played = rng.integers(0, config.cells + 1, size=(count, 1))
+    turn = np.arange(config.cells)
+    pieces = np.where(turn % 2 == 0, CELL_X, CELL_O).astype(np.uint8)
+    boards = np.zeros((count, config.cells), dtype=np.uint8)
+    np.put_along_axis(boards, order, np.where(turn < played, pieces, CELL_EMPTY), axis=1)
+    return boards
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify random boards in bulk and time it")
+    parser.add_argument('--boards', type=int, default=1000000, help="number of boards (default 1e6)")
+    parser.add_argument('--seed', type=int, default=None, help="RNG seed for reproducible runs")
+    parser.add_argument('--size', type=int, default=3, help="board size (default 3)")
+    parser.add_argument('--win-length', type=int, default=None, help="pieces in a row to win")
+    parser.add_argument('--check', type=int, default=1000,
+                        help="boards to cross-check against the engine (default 1000)")
+    args = parser.parse_args(argv)
+
+    config = board_config(args.size, args.win_length or args.size)
+    boards = random_boards(args.boards, config, args.seed)
+    start = time.perf_counter()
+    results, moves = classify(boards, config)
+    elapsed = time.perf_counter() - start
+
+    counts = np.bincount(results, minlength=len(RESULT_NAMES))
+    summary = ', '.join(f"{name} {count}" for name, count in zip(RESULT_NAMES, counts))
+    print(f"{args.boards} boards on {config.name} in {elapsed * 1000:.1f} ms "
+          f"({args.boards / elapsed:,.0f} boards/s): {summary}")
+
+    codes = {PLAYER_X: X_WINS, PLAYER_O: O_WINS}
+    mismatches = 0
+    for row, result in zip(to_bitboards(boards[:args.check], config), results[:args.check]):
+        expected = codes.get(row.winner(), DRAW if row.is_full() else IN_PROGRESS)
+        mismatches += expected != result
+    print(f"Cross-checked {min(args.check, args.boards)} boards against the engine: "
+          f"{mismatches} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
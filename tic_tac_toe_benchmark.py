@@ -0,0 +1,221 @@
+"""Benchmark suite for the AI and the board primitives.
+
+Runs a fixed corpus of positions (empty board, early, mid and endgame)
+through the board primitives, the search and the per-difficulty AI move,
+and reports throughput, nodes per second, latency percentiles and peak
+memory. Results are written as JSON so runs can be compared:
+
+    python tic_tac_toe_benchmark.py --output baseline.json
+    python tic_tac_toe_benchmark.py --baseline baseline.json
+
+Searches always start from a fresh engine (cold transposition table), so
+each repeat measures the full cost of a move.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from tic_tac_toe_engine import (
+    CLASSIC, DIFFICULTIES, PLAYER_O, PLAYER_X, Bitboard, TicTacToeEngine, board_config
+)
+
+# (phase, board config, cells as a string with '.' for empty)
+CORPUS = (
+    ('empty', CLASSIC, '.........'),
+    ('early', CLASSIC, 'X...O....'),
+    ('mid', CLASSIC, 'XO..X...O'),
+    ('endgame', CLASSIC, 'XOX.O..XO'),
+    ('4x4-early', board_config(4, 4), 'X....O..........'),
+)
+
+# Relative slowdown of a latency metric that counts as a regression; the
+# sub-microsecond primitives are noisy enough to need a generous margin
+REGRESSION_THRESHOLD = 0.25
+
+# Smallest absolute slowdown per metric worth flagging, below timer noise
+MIN_ABSOLUTE_CHANGE = {'p50_us': 0.1, 'p50_ms': 0.05}
+
+
+def load_position(config, cells):
+    """Engine set up on the corpus position, with the right side to move"""
+    engine = TicTacToeEngine(config)
+    # Book moves would hide the search cost being measured
+    engine.use_book = False
+    engine.position = Bitboard.from_cells([' ' if c == '.' else c for c in cells], config)
+    engine.current_player = (PLAYER_X if engine.position.x.bit_count() == engine.position.o.bit_count()
+                             else PLAYER_O)
+    if engine.is_game_over():
+        raise ValueError(f"Corpus position {cells} is already decided")
+    return engine
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(durations, unit_scale, unit):
+    """p50/p90/p99/mean of a list of durations in seconds"""
+    values = sorted(d * unit_scale for d in durations)
+    return {
+        f'p50_{unit}': percentile(values, 0.50),
+        f'p90_{unit}': percentile(values, 0.90),
+        f'p99_{unit}': percentile(values, 0.99),
+        f'mean_{unit}': sum(values) / len(values),
+    }
+
+
+def bench_primitive(engine, fn, repeats):
+    """Time a cheap call in batches of 1000 to beat timer resolution"""
+    batch = 1000
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(batch):
+            fn(engine)
+        durations.append((time.perf_counter() - start) / batch)
+    result = latency_summary(durations, 1e6, 'us')
+    result['ops_per_sec'] = 1 / (sum(durations) / len(durations))
+    return result
+
+
+def bench_search(config, cells, fn, repeats):
+    """Time fn(engine) on a fresh engine per repeat, with node counts and peak memory"""
+    durations = []
+    nodes = 0
+    peak = 0
+    for _ in range(repeats):
+        engine = load_position(config, cells)
+        engine.nodes = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(engine)
+        durations.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        nodes += engine.nodes
+
+    # tracemalloc slows allocation-heavy code; report untraced timings
+    durations = []
+    for _ in range(repeats):
+        engine = load_position(config, cells)
+        start = time.perf_counter()
+        fn(engine)
+        durations.append(time.perf_counter() - start)
+
+    result = latency_summary(durations, 1e3, 'ms')
+    result['nodes'] = nodes // repeats
+    result['nodes_per_sec'] = nodes / sum(durations) if nodes else 0.0
+    result['peak_kib'] = peak / 1024
+    return result
+
+
+PRIMITIVES = {
+    'check_winner': lambda engine: engine.check_winner(),
+    'game_result': lambda engine: engine.game_result(),
+    'get_available_moves': lambda engine: engine.get_available_moves(),
+    'is_board_full': lambda engine: engine.is_board_full(),
+}
+
+SEARCHES = {
+    'minimax': lambda engine: engine.minimax(0, engine.current_player == PLAYER_O),
+    'get_best_move': lambda engine: engine.get_best_move(),
+}
+
+
+def run_benchmarks(repeats=30, phases=None):
+    """Run the whole suite; return a JSON-serialisable dict"""
+    results = {}
+    for phase, config, cells in CORPUS:
+        if phases and phase not in phases:
+            continue
+        engine = load_position(config, cells)
+        for name, fn in PRIMITIVES.items():
+            results[f'primitive/{name}/{phase}'] = bench_primitive(engine, fn, repeats)
+        for name, fn in SEARCHES.items():
+            results[f'search/{name}/{phase}'] = bench_search(config, cells, fn, repeats)
+        if not config.is_classic:
+            # AI moves on larger boards just run out their time budget
+            continue
+        for difficulty in DIFFICULTIES:
+            results[f'ai_move/{difficulty}/{phase}'] = bench_search(
+                config, cells, lambda engine, d=difficulty: engine.get_ai_move(d), repeats
+            )
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'repeats': repeats,
+        },
+        'benchmarks': results,
+    }
+
+
+def compare(current, baseline):
+    """Yield (name, metric, old, new, change) for every shared p50 metric.
+
+    change is the relative slowdown (positive = slower).
+    """
+    old_results = baseline.get('benchmarks', {})
+    for name, metrics in current['benchmarks'].items():
+        old = old_results.get(name)
+        if not old:
+            continue
+        for metric in ('p50_us', 'p50_ms'):
+            if metric in metrics and old.get(metric):
+                change = metrics[metric] / old[metric] - 1
+                yield name, metric, old[metric], metrics[metric], change
+
+
+def format_result(name, metrics):
+    parts = [name.ljust(42)]
+    if 'p50_us' in metrics:
+        parts.append(f"p50 {metrics['p50_us']:9.2f} us  p99 {metrics['p99_us']:9.2f} us  "
+                     f"{metrics['ops_per_sec']:12,.0f} ops/s")
+    else:
+        parts.append(f"p50 {metrics['p50_ms']:9.3f} ms  p99 {metrics['p99_ms']:9.3f} ms  "
+                     f"{metrics['nodes']:8d} nodes  {metrics['nodes_per_sec']:10,.0f} nodes/s  "
+                     f"peak {metrics['peak_kib']:8.1f} KiB")
+    return '  '.join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Tic-Tac-Toe engine")
+    parser.add_argument('--repeats', type=int, default=30, help="samples per benchmark (default 30)")
+    parser.add_argument('--phase', action='append', dest='phases',
+                        help="only run this corpus phase (repeatable)")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--baseline', help="compare against a previously saved JSON file")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="relative p50 slowdown that counts as a regression (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.repeats, args.phases)
+    for name, metrics in results['benchmarks'].items():
+        print(format_result(name, metrics))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = 0
+        print(f"\nCompared with {args.baseline}:")
+        for name, metric, old, new, change in compare(results, baseline):
+            regressed = change > args.threshold and new - old > MIN_ABSOLUTE_CHANGE[metric]
+            flag = 'REGRESSION' if regressed else ''
+            regressions += bool(flag)
+            print(f"  {name.ljust(42)} {metric} {old:10.3f} -> {new:10.3f} ({change:+.1%}) {flag}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""Opening book: precomputed moves for the first plies of a game.
+
+The widest part of the search tree is the first few plies, so the book
+stores the best move for every position up to a few plies deep, found
+offline by searching each one BOOK_EXTRA_PLIES deeper than hard mode's
+time budget reaches on the generating machine. Positions are stored once
+per symmetry class under their canonical key, which keeps the book
+small; a lookup is a single dict read after canonicalizing the (few)
+pieces on the board. The AI players (get_ai_move) consult the book
+before searching; the search primitives never do.
+
+The books for the larger board presets are shipped in opening_books/
+(3x3 needs none: the perfect-play table answers first). Regenerate them
+after changing the search or evaluation; this takes about a quarter of an hour:
+
+    python tic_tac_toe_book.py --size 4 --plies 3
+    python tic_tac_toe_book.py --size 5 --win-length 4 --plies 5
+    python tic_tac_toe_book.py --size 15 --win-length 5 --plies 3
+"""
+import argparse
+import functools
+import os
+import struct
+import sys
+import time
+
+from tic_tac_toe_cache import key_bytes, write_atomic
+from tic_tac_toe_engine import (
+    SEARCH_TIME_BUDGET_MS, WIN_THRESHOLD, GameState, TicTacToeEngine, board_config,
+    iter_bits, other_player
+)
+
+MAGIC = b'TTTB'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHHI')
+MOVE = struct.Struct('<H')
+
+DEFAULT_BOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'opening_books')
+
+# Book depth in plies from the empty board, and the entry cap per book
+DEFAULT_PLIES = 4
+
+# How much deeper than hard mode's timed search each book move is searched
+BOOK_EXTRA_PLIES = 2
+MAX_BOOK_ENTRIES = 1 << 16
+
+
+def book_path(config, directory=DEFAULT_BOOK_DIR):
+    return os.path.join(directory, f"book_{config.size}x{config.size}_{config.win_length}.bin")
+
+
+@functools.lru_cache(maxsize=None)
+def symmetry_maps(config):
+    """(maps, inverses): the board symmetries as cell maps and their inverses"""
+    maps = config.symmetries()
+    inverses = []
+    for cells in maps:
+        inverse = [0] * config.cells
+        for cell, image in enumerate(cells):
+            inverse[image] = cell
+        inverses.append(tuple(inverse))
+    return maps, tuple(inverses)
+
+
+def canonical(config, me, opp):
+    """(key, symmetry index) of the smallest image of (me, opp).
+
+    Only occupied cells are mapped, so this stays cheap on big boards
+    while the book positions have few pieces.
+    """
+    best = None
+    for index, cells in enumerate(symmetry_maps(config)[0]):
+        image_me = sum(1 << cells[cell] for cell in iter_bits(me))
+        image_opp = sum(1 << cells[cell] for cell in iter_bits(opp))
+        key = image_me << config.cells | image_opp
+        if best is None or key < best[0]:
+            best = (key, index)
+    return best
+
+
+class OpeningBook:
+    """Canonical position key -> best move in the canonical orientation"""
+
+    def __init__(self, config, moves=None):
+        self.config = config
+        self.moves = moves if moves is not None else {}
+        # Positions with more pieces than this are out of book at a glance
+        self.max_pieces = max((key.bit_count() for key in self.moves), default=0)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def add(self, me, opp, move):
+        key, index = canonical(self.config, me, opp)
+        self.moves[key] = symmetry_maps(self.config)[0][index][move]
+        self.max_pieces = max(self.max_pieces, key.bit_count())
+
+    def lookup(self, me, opp):
+        """Best move for the side owning me, or None if out of book"""
+        if not self.moves or (me | opp).bit_count() > self.max_pieces:
+            return None
+        key, index = canonical(self.config, me, opp)
+        move = self.moves.get(key)
+        if move is None:
+            return None
+        return symmetry_maps(self.config)[1][index][move]
+
+    def encode(self):
+        width = key_bytes(self.config)
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, self.config.size, self.config.win_length,
+                             len(self.moves))]
+        for key, move in sorted(self.moves.items()):
+            parts.append(key.to_bytes(width, 'little') + MOVE.pack(move))
+        return b''.join(parts)
+
+    @classmethod
+    def decode(cls, config, data):
+        """Parse a book file; raises ValueError if it is for other rules"""
+        magic, version, size, win_length, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not an opening book or wrong format version")
+        if (size, win_length) != (config.size, config.win_length):
+            raise ValueError(f"Book is for {size}x{size}/{win_length}, not {config.name}")
+        width = key_bytes(config)
+        stride = width + MOVE.size
+        if len(data) != HEADER.size + count * stride:
+            raise ValueError("Opening book has the wrong size")
+        moves = {}
+        for offset in range(HEADER.size, len(data), stride):
+            key = int.from_bytes(data[offset:offset + width], 'little')
+            (moves[key],) = MOVE.unpack_from(data, offset + width)
+        return cls(config, moves)
+
+
+def book_search(engine, depth=None, extra_plies=BOOK_EXTRA_PLIES):
+    """Best move for the engine's position, searched for the book.
+
+    Without an explicit depth, the position is first searched with hard
+    mode's time budget and then extra_plies deeper than that reached, so
+    a book move never stands in for a deeper search.
+    """
+    if depth is None:
+        probe = engine.search(SEARCH_TIME_BUDGET_MS['hard'])
+        if abs(probe.score) > WIN_THRESHOLD:
+            # Proven result: searching deeper can't change it
+            return probe.move
+        depth = probe.depth + extra_plies
+    return engine.search(max_depth=depth).move
+
+
+def build_book(config, plies=DEFAULT_PLIES, depth=None, max_entries=MAX_BOOK_ENTRIES,
+               progress=None, extra_plies=BOOK_EXTRA_PLIES):
+    """Search every position up to plies moves deep, breadth first.
+
+    Each position is searched by book_search() (to depth if given).
+    Positions that are already decided are skipped; generation stops at
+    max_entries.
+    """
+    engine = TicTacToeEngine(config)
+    book = OpeningBook(config)
+    frontier = [GameState(config)]
+    for ply in range(plies):
+        seen = set()
+        next_frontier = []
+        for state in frontier:
+            me = state.pieces(state.to_move)
+            opp = state.pieces(other_player(state.to_move))
+            key, _ = canonical(config, me, opp)
+            if key in seen:
+                continue
+            seen.add(key)
+            if len(book) >= max_entries:
+                return book
+
+            engine.state = state.copy()
+            book.add(me, opp, book_search(engine, depth, extra_plies))
+
+            for child in iter_bits(config.candidate_moves(me, opp)):
+                next_state = state.copy()
+                if not next_state.make(child) and not next_state.is_full():
+                    next_frontier.append(next_state)
+        if progress:
+            progress(ply, len(book))
+        frontier = next_frontier
+    return book
+
+
+def write_book(book, path):
+    """Atomically write book to path"""
+    write_atomic(path, book.encode())
+    return path
+
+
+def load_book(config, directory=DEFAULT_BOOK_DIR):
+    """The book for config, or an empty one if there is no usable file"""
+    try:
+        with open(book_path(config, directory), 'rb') as f:
+            return OpeningBook.decode(config, f.read())
+    except (OSError, ValueError, struct.error):
+        return OpeningBook(config)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate an opening book")
+    parser.add_argument('--size', type=int, default=3, help="board size (default 3)")
+    parser.add_argument('--win-length', type=int, default=None, help="pieces in a row to win")
+    parser.add_argument('--plies', type=int, default=DEFAULT_PLIES,
+                        help=f"book depth in plies (default {DEFAULT_PLIES})")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="fixed search depth per position (default: what hard mode "
+                             f"reaches + {BOOK_EXTRA_PLIES})")
+    parser.add_argument('--extra-plies', type=int, default=BOOK_EXTRA_PLIES,
+                        help=f"plies beyond hard mode's reach (default {BOOK_EXTRA_PLIES})")
+    parser.add_argument('--max-entries', type=int, default=MAX_BOOK_ENTRIES,
+                        help=f"entry cap (default {MAX_BOOK_ENTRIES})")
+    parser.add_argument('--output', default=None, help="book file (default: opening_books/)")
+    args = parser.parse_args(argv)
+
+    config = board_config(args.size, args.win_length or args.size)
+    start = time.perf_counter()
+    book = build_book(config, args.plies, args.depth, args.max_entries,
+                      progress=lambda ply, size: print(f"ply {ply}: {size} positions"),
+                      extra_plies=args.extra_plies)
+    path = write_book(book, args.output or book_path(config))
+    print(f"Wrote {path}: {len(book)} positions, {os.path.getsize(path)} bytes "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""Persistent transposition table cache.
+
+Search results from earlier sessions are kept on disk, one file per board
+configuration, so a new session (or a self-play worker) starts with a
+warm transposition table instead of paying for the first searches again.
+
+Entries are keyed by the canonical (symmetry-reduced) position key and
+store what the transposition table stores. The header records the board
+size, the win length and a version that is bumped whenever scoring
+changes, and a file that doesn't match is ignored. The cache is only read
+on the first search, and writes go through a temporary file and
+os.replace(), so a crash never leaves a half-written cache. save_async()
+does the write on a background thread.
+
+    python tic_tac_toe_cache.py            # list the cache files
+"""
+import math
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+MAGIC = b'TTTC'
+# Bump when scores change meaning (evaluation, win scoring, key layout)
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHHI')
+ENTRY_TAIL = struct.Struct('<qBB')
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai_cache')
+
+# Entries searched shallower than this are cheaper to redo than to store
+MIN_CACHE_DEPTH = 2
+
+# Most entries kept per board configuration; the deepest ones win
+MAX_CACHE_ENTRIES = 1 << 18
+
+
+def cache_path(config, directory=DEFAULT_CACHE_DIR):
+    return os.path.join(directory, f"tt_{config.size}x{config.size}_{config.win_length}.bin")
+
+
+def key_bytes(config):
+    """Bytes needed for a canonical key: two bits per cell"""
+    return (2 * config.cells + 7) // 8
+
+
+def encode_entries(config, entries):
+    """Pack (key, value, flag, depth) entries into the file layout"""
+    size = key_bytes(config)
+    parts = [HEADER.pack(MAGIC, FORMAT_VERSION, config.size, config.win_length, len(entries))]
+    for key, value, flag, depth in entries:
+        parts.append(key.to_bytes(size, 'little') + ENTRY_TAIL.pack(value, flag, min(depth, 255)))
+    return b''.join(parts)
+
+
+def decode_entries(config, data):
+    """Unpack a cache file; raises ValueError if it is for other rules"""
+    magic, version, size, win_length, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("Not a transposition cache or wrong format version")
+    if (size, win_length) != (config.size, config.win_length):
+        raise ValueError(f"Cache is for {size}x{size}/{win_length}, not {config.name}")
+    width = key_bytes(config)
+    stride = width + ENTRY_TAIL.size
+    if len(data) != HEADER.size + count * stride:
+        raise ValueError("Transposition cache has the wrong size")
+    entries = []
+    offset = HEADER.size
+    for _ in range(count):
+        key = int.from_bytes(data[offset:offset + width], 'little')
+        value, flag, depth = ENTRY_TAIL.unpack_from(data, offset + width)
+        entries.append((key, value, flag, depth))
+        offset += stride
+    return entries
+
+
+def write_atomic(path, data):
+    """Write data to path through a temporary file in the same directory.
+
+    Shared by every generated AI file (table, cache, opening books).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates the file private; other users should be able to read it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PersistentCache:
+    """On-disk copy of the deep entries of one configuration's table"""
+
+    def __init__(self, config, directory=DEFAULT_CACHE_DIR):
+        self.config = config
+        self.directory = directory
+        self.path = cache_path(config, directory)
+        self.loaded = False
+        # Entries read from disk, kept so a save doesn't drop what this
+        # session's table has since overwritten
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.writer = None
+
+    def load_into(self, tt):
+        """Read the file once and merge it into tt; return the entry count.
+
+        A missing, stale or corrupt file just means a cold start.
+        """
+        with self.lock:
+            if self.loaded:
+                return 0
+            self.loaded = True
+            try:
+                with open(self.path, 'rb') as f:
+                    entries = decode_entries(self.config, f.read())
+            except (OSError, ValueError, struct.error):
+                return 0
+            self.entries = {entry[0]: entry for entry in entries}
+        tt.merge(entries)
+        return len(entries)
+
+    def collect(self, tt):
+        """Entries to write: the cached ones updated with tt's deep entries"""
+        merged = dict(self.entries)
+        for entry in tt.items(MIN_CACHE_DEPTH):
+            old = merged.get(entry[0])
+            if (old is None or old[3] <= entry[3]) and math.isfinite(entry[1]):
+                merged[entry[0]] = entry
+        entries = list(merged.values())
+        if len(entries) > MAX_CACHE_ENTRIES:
+            entries.sort(key=lambda entry: entry[3], reverse=True)
+            del entries[MAX_CACHE_ENTRIES:]
+        return entries
+
+    def save(self, tt):
+        """Write the cache now; returns the number of entries written"""
+        with self.lock:
+            entries = self.collect(tt)
+            if not entries:
+                return 0
+            write_atomic(self.path, encode_entries(self.config, entries))
+            self.entries = {entry[0]: entry for entry in entries}
+        return len(entries)
+
+    def save_async(self, tt):
+        """Write the cache on a background thread, unless a write is running"""
+        if self.writer is not None and self.writer.is_alive():
+            return False
+        self.writer = threading.Thread(target=self._save_quietly, args=(tt,),
+                                       name="tt-cache-writer", daemon=True)
+        self.writer.start()
+        return True
+
+    def _save_quietly(self, tt):
+        try:
+            self.save(tt)
+        except OSError:
+            # Read-only install or full disk: the cache is only an optimisation
+            pass
+
+    def wait(self):
+        """Block until a background write has finished"""
+        if self.writer is not None:
+            self.writer.join()
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CACHE_DIR
+    if not os.path.isdir(directory):
+        print(f"No cache at {directory}")
+        return 0
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size:
+            continue
+        magic, version, size, win_length, count = HEADER.unpack(header)
+        if magic == MAGIC:
+            print(f"{name}: {size}x{size}/{win_length}, version {version}, {count} entries, "
+                  f"{os.path.getsize(path)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
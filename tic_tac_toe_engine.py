@@ -0,0 +1,1196 @@
+"""Headless Tic-Tac-Toe engine.
+
+Holds the board state, move generation, win detection and the AI search.
+Nothing in here imports tkinter, so the AI can be imported, benchmarked or
+run on a server without a display.
+
+Boards are N x N with k in a row to win, described by a BoardConfig. The
+classic 3x3 game is solved exactly; larger boards use a depth-limited
+search with a line-counting heuristic.
+"""
+import copy
+import functools
+import math
+import random
+import time
+from collections import deque
+
+EMPTY = ' '
+PLAYER_X = 'X'
+PLAYER_O = 'O'
+
+DIFFICULTIES = ('easy', 'medium', 'hard', 'mcts')
+
+# Wall-clock budget per AI move for the difficulties that search
+SEARCH_TIME_BUDGET_MS = {'medium': 200, 'hard': 1000, 'mcts': 1000}
+
+# Medium searches MEDIUM_MAX_DEPTH plies on its own budget, without the
+# table or book, so on the larger boards it loses to hard's deeper search.
+# On 3x3 two plies already hold every line a human can try, so medium also
+# plays a random move MEDIUM_RANDOM_RATE of the time to stay beatable.
+MEDIUM_MAX_DEPTH = 2
+MEDIUM_RANDOM_RATE = 0.3
+
+# Entries in the scratch table of a depth-capped search
+SHALLOW_TT_SIZE = 1 << 12
+
+# Playouts per move for the Monte Carlo difficulty, capped by its time budget
+MCTS_PLAYOUTS = 3000
+
+# How many nodes the search visits between looks at the clock
+DEADLINE_CHECK_INTERVAL = 1024
+
+# SearchStats kept per engine while instrumentation is enabled
+INSTRUMENTATION_HISTORY = 100
+
+# Score of winning on the move; a win n plies further away scores n less,
+# so the search prefers the fastest win and the slowest loss. Heuristic
+# evaluations always stay below WIN_THRESHOLD.
+WIN_SCORE = 10 ** 9
+WIN_THRESHOLD = WIN_SCORE - 1000
+
+# Largest board (cells) on which every empty cell is a candidate move;
+# beyond it the search only looks at cells next to existing pieces
+FULL_WIDTH_CELLS = 16
+
+
+def other_player(player):
+    """Return the opponent of player"""
+    return PLAYER_O if player == PLAYER_X else PLAYER_X
+
+
+def iter_bits(mask):
+    """Yield the cell index of every set bit in mask, lowest first"""
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+def score_to_tt(score, ply):
+    """Make a win/loss score relative to the node before caching it"""
+    if score > WIN_THRESHOLD:
+        return score + ply
+    if score < -WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def score_from_tt(score, ply):
+    """Turn a cached node-relative win/loss score back into a root score"""
+    if score > WIN_THRESHOLD:
+        return score - ply
+    if score < -WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def generate_win_lines(size, win_length):
+    """Every run of win_length cells in a row, column or diagonal"""
+    lines = []
+    for row in range(size):
+        for col in range(size):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + d_row * (win_length - 1)
+                end_col = col + d_col * (win_length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append([(row + d_row * i) * size + col + d_col * i
+                                  for i in range(win_length)])
+    return lines
+
+
+class BoardConfig:
+    """Board size and win length, plus the masks derived from them"""
+
+    # Symmetry reduction needs per-chunk lookup tables; past this size they
+    # cost more memory than the rare symmetric transpositions save
+    MAX_SYMMETRY_SIZE = 8
+
+    def __init__(self, size=3, win_length=3):
+        if size < 1 or not 1 <= win_length <= size:
+            raise ValueError(f"Invalid board {size}x{size} with {win_length} in a row")
+        self.size = size
+        self.win_length = win_length
+        self.cells = size * size
+        self.full_mask = (1 << self.cells) - 1
+        self.center = self.cells // 2 if size % 2 else (size // 2) * (size + 1)
+
+        if (size, win_length) == (3, 3):
+            # Keep the historical rows, columns, diagonals order
+            self.win_lines = [
+                [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
+                [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
+                [0, 4, 8], [2, 4, 6]              # diagonals
+            ]
+        else:
+            self.win_lines = generate_win_lines(size, win_length)
+        self.win_masks = tuple(sum(1 << i for i in line) for line in self.win_lines)
+
+        # Win masks through each cell, keyed by the cell's bit, so a freshly
+        # placed piece is only tested against the lines it can complete
+        self.win_masks_by_bit = {
+            1 << cell: tuple(mask for mask in self.win_masks if mask >> cell & 1)
+            for cell in range(self.cells)
+        }
+
+        # Cells most worth trying first: those on the most winning lines,
+        # nearest the middle first (center, corners, edges on 3x3)
+        middle = (size - 1) / 2
+        self.move_order = tuple(sorted(
+            range(self.cells),
+            key=lambda cell: (-len(self.win_masks_by_bit[1 << cell]),
+                              (cell // size - middle) ** 2 + (cell % size - middle) ** 2, cell)
+        ))
+
+        # Indices of the win lines through each cell, for GameState
+        self.lines_by_cell = tuple(
+            tuple(i for i, mask in enumerate(self.win_masks) if mask >> cell & 1)
+            for cell in range(self.cells)
+        )
+
+        # Heuristic weight of a line holding n pieces of a single player
+        self.line_weights = [0] + [10 ** (n - 1) for n in range(1, win_length + 1)]
+
+        # Change in a line's weight, for its owner-to-be, when a piece joins
+        # n of its own and t of the opponent's: line_deltas[n][t]
+        def line_value(mine, theirs):
+            if theirs == 0:
+                return self.line_weights[mine]
+            return -self.line_weights[theirs] if mine == 0 else 0
+
+        self.line_deltas = [
+            [line_value(n + 1, t) - line_value(n, t) for t in range(win_length + 1)]
+            for n in range(win_length)
+        ]
+
+        first_col = sum(1 << (row * size) for row in range(size))
+        self.not_first_col = self.full_mask & ~first_col
+        self.not_last_col = self.full_mask & ~(first_col << (size - 1))
+
+        self.symmetry_chunks = self._build_symmetry_chunks()
+
+    @property
+    def name(self):
+        return f"{self.size}x{self.size}/{self.win_length}"
+
+    @property
+    def is_classic(self):
+        return self.size == 3 and self.win_length == 3
+
+    def __eq__(self, other):
+        return (isinstance(other, BoardConfig) and self.size == other.size
+                and self.win_length == other.win_length)
+
+    def __hash__(self):
+        return hash((self.size, self.win_length))
+
+    def __repr__(self):
+        return f"BoardConfig(size={self.size}, win_length={self.win_length})"
+
+    def symmetries(self):
+        """The 8 rotations and reflections of the board, as cell maps"""
+        n = self.size - 1
+        transforms = (
+            lambda r, c: (r, c),
+            lambda r, c: (c, n - r),
+            lambda r, c: (n - r, n - c),
+            lambda r, c: (n - c, r),
+            lambda r, c: (r, n - c),
+            lambda r, c: (n - r, c),
+            lambda r, c: (c, r),
+            lambda r, c: (n - c, n - r),
+        )
+        maps = []
+        for transform in transforms:
+            cells = []
+            for cell in range(self.cells):
+                row, col = transform(cell // self.size, cell % self.size)
+                cells.append(row * self.size + col)
+            maps.append(tuple(cells))
+        return maps
+
+    def _build_symmetry_chunks(self):
+        """Per-symmetry lookup tables over chunks of whole rows.
+
+        Each chunk covers up to 12 bits, so transforming a mask costs one
+        table read per chunk. On 3x3 the whole board is a single chunk.
+        """
+        if self.size > self.MAX_SYMMETRY_SIZE:
+            return None
+        rows_per_chunk = max(1, min(self.size, 12 // self.size))
+        chunk_bits = rows_per_chunk * self.size
+        tables = []
+        for cells in self.symmetries():
+            chunks = []
+            for shift in range(0, self.cells, chunk_bits):
+                width = min(chunk_bits, self.cells - shift)
+                chunks.append((shift, (1 << width) - 1, tuple(
+                    sum(1 << cells[shift + i] for i in iter_bits(bits))
+                    for bits in range(1 << width)
+                )))
+            tables.append(tuple(chunks))
+        return tuple(tables)
+
+    def transform(self, symmetry, mask):
+        """Image of mask under one of the symmetry tables"""
+        image = 0
+        for shift, chunk_mask, table in symmetry:
+            image |= table[mask >> shift & chunk_mask]
+        return image
+
+    def canonical_key(self, me, opp):
+        """Smallest packed (me, opp) over all board symmetries"""
+        cells = self.cells
+        if self.symmetry_chunks is None:
+            return me << cells | opp
+        if len(self.symmetry_chunks[0]) == 1:
+            return min(sym[0][2][me] << cells | sym[0][2][opp] for sym in self.symmetry_chunks)
+        transform = self.transform
+        return min(transform(sym, me) << cells | transform(sym, opp)
+                   for sym in self.symmetry_chunks)
+
+    def completes_line(self, pieces, bit):
+        """True if the piece at bit gives pieces a full winning line"""
+        for mask in self.win_masks_by_bit[bit]:
+            if pieces & mask == mask:
+                return True
+        return False
+
+    def has_won(self, pieces):
+        """True if pieces contains any winning line"""
+        for mask in self.win_masks:
+            if pieces & mask == mask:
+                return True
+        return False
+
+    def neighbours(self, mask):
+        """Cells within one step (including diagonals) of any cell in mask"""
+        size = self.size
+        row = mask | (mask & self.not_last_col) << 1 | (mask & self.not_first_col) >> 1
+        return (row | row << size | row >> size) & self.full_mask
+
+    def candidate_moves(self, me, opp):
+        """Moves worth searching: every empty cell on small boards, else
+        only cells next to a piece (the center on an empty board)"""
+        occupied = me | opp
+        empty = self.full_mask & ~occupied
+        if self.cells <= FULL_WIDTH_CELLS:
+            return empty
+        if not occupied:
+            return 1 << self.center
+        return self.neighbours(occupied) & empty
+
+    def default_depth(self):
+        """Search depth that keeps a move responsive on this board"""
+        if self.cells <= 9:
+            return self.cells
+        if self.cells <= 16:
+            return 4
+        if self.cells <= 25:
+            return 3
+        return 2
+
+
+@functools.lru_cache(maxsize=None)
+def board_config(size=3, win_length=3):
+    """The shared BoardConfig for size and win_length.
+
+    Building the symmetry tables takes a noticeable fraction of a second
+    on 4x4 and larger, so every caller goes through this cache.
+    """
+    return BoardConfig(size, win_length)
+
+
+CLASSIC = board_config(3, 3)
+
+# Presets offered by the UI: (label, size, win length)
+BOARD_PRESETS = (
+    ('3x3', 3, 3),
+    ('4x4', 4, 4),
+    ('5x5', 5, 4),
+    ('Gomoku 15x15', 15, 5),
+)
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move budget runs out"""
+
+
+class SearchCancelled(Exception):
+    """Raised inside the search when its stop event is set"""
+
+
+class SearchResult:
+    """Outcome of an iterative-deepening search"""
+
+    def __init__(self, move, score, depth, nodes, elapsed_ms):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed_ms = elapsed_ms
+
+    def __repr__(self):
+        return (f"SearchResult(move={self.move}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, elapsed_ms={self.elapsed_ms:.1f})")
+
+
+class WinResult:
+    """How a finished game ended.
+
+    winner is 'X', 'O' or 'draw'; line is the tuple of winning cells, or
+    None for a draw.
+    """
+
+    def __init__(self, winner, line=None):
+        self.winner = winner
+        self.line = line
+
+    @property
+    def is_draw(self):
+        return self.line is None
+
+    def __repr__(self):
+        return f"WinResult(winner={self.winner!r}, line={self.line})"
+
+
+class SearchStats:
+    """Cost of one get_best_move or search call, recorded when instrumented"""
+
+    def __init__(self, kind, move, score, depth, nodes, cutoffs, tt_hits, tt_probes,
+                 max_ply, wall_ms):
+        self.kind = kind
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.cutoffs = cutoffs
+        self.tt_hits = tt_hits
+        self.tt_probes = tt_probes
+        self.max_ply = max_ply
+        self.wall_ms = wall_ms
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.wall_ms * 1000 if self.wall_ms else 0.0
+
+    def as_dict(self):
+        return dict(vars(self), nodes_per_second=self.nodes_per_second)
+
+    def __repr__(self):
+        return (f"SearchStats({self.kind}: move={self.move}, depth={self.depth}, "
+                f"nodes={self.nodes}, cutoffs={self.cutoffs}, tt_hits={self.tt_hits}/"
+                f"{self.tt_probes}, max_ply={self.max_ply}, wall_ms={self.wall_ms:.2f})")
+
+
+class SessionStats:
+    """Win/loss/draw tally shown in the statistics panel.
+
+    'player' counts wins for X (the human in AI mode) and 'opponent' wins
+    for O, so self-play batches and the GUI share the same numbers.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.scores = {'player': 0, 'opponent': 0, 'draw': 0}
+        self.game_count = 0
+
+    def record(self, result):
+        """Count one finished game: result is 'X', 'O' or 'draw'"""
+        self.game_count += 1
+        if result == PLAYER_X:
+            self.scores['player'] += 1
+        elif result == PLAYER_O:
+            self.scores['opponent'] += 1
+        else:
+            self.scores['draw'] += 1
+
+    def merge(self, other):
+        """Fold another SessionStats into this one"""
+        self.game_count += other.game_count
+        for key, value in other.scores.items():
+            self.scores[key] += value
+
+    @property
+    def win_rate(self):
+        """Percentage of games won by X"""
+        return self.scores['player'] / self.game_count * 100 if self.game_count else 0.0
+
+    def __repr__(self):
+        return f"SessionStats(games={self.game_count}, scores={self.scores})"
+
+
+class TranspositionTable:
+    """Fixed-size score cache keyed by canonical position.
+
+    Entries live in a power-of-two number of slots indexed by the key's
+    hash. A new entry always replaces whatever was in its slot, which keeps
+    memory bounded and lookups O(1).
+    """
+
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    def __init__(self, max_entries=1 << 16):
+        size = 1
+        while size < max_entries:
+            size <<= 1
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.entries = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (value, flag, depth) for key, or None"""
+        entry = self.slots[hash(key) & (self.size - 1)]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:]
+        self.misses += 1
+        return None
+
+    def store(self, key, value, flag, depth):
+        index = hash(key) & (self.size - 1)
+        old = self.slots[index]
+        if old is None:
+            self.entries += 1
+        elif old[0] != key:
+            self.evictions += 1
+        self.slots[index] = (key, value, flag, depth)
+
+    def items(self, min_depth=0):
+        """Stored (key, value, flag, depth) entries searched to at least min_depth"""
+        return [entry for entry in self.slots if entry is not None and entry[3] >= min_depth]
+
+    def merge(self, entries):
+        """Store entries from another table, keeping deeper results already here"""
+        mask = self.size - 1
+        slots = self.slots
+        for entry in entries:
+            old = slots[hash(entry[0]) & mask]
+            if old is None or old[0] != entry[0] or old[3] <= entry[3]:
+                self.store(*entry)
+
+    def __len__(self):
+        return self.entries
+
+    def stats(self):
+        """Counters for inspection and benchmarks"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': self.entries,
+            'capacity': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class Bitboard:
+    """Compact board: one int of X pieces and one of O pieces"""
+
+    __slots__ = ('x', 'o', 'config')
+
+    def __init__(self, x=0, o=0, config=CLASSIC):
+        self.x = x
+        self.o = o
+        self.config = config
+
+    @classmethod
+    def from_cells(cls, cells, config=None):
+        """Build a bitboard from a list of ' '/'X'/'O' cells"""
+        if config is None:
+            size = math.isqrt(len(cells))
+            config = board_config(size, size)
+        x = o = 0
+        for i, cell in enumerate(cells):
+            if cell == PLAYER_X:
+                x |= 1 << i
+            elif cell == PLAYER_O:
+                o |= 1 << i
+        return cls(x, o, config)
+
+    def to_cells(self):
+        """Return the board as a list of ' '/'X'/'O' cells"""
+        return [self.cell(i) for i in range(self.config.cells)]
+
+    def copy(self):
+        return Bitboard(self.x, self.o, self.config)
+
+    def __eq__(self, other):
+        return (isinstance(other, Bitboard) and self.x == other.x and self.o == other.o
+                and self.config == other.config)
+
+    def __hash__(self):
+        return hash((self.x, self.o, self.config))
+
+    def __repr__(self):
+        return f"Bitboard(x={self.x:#x}, o={self.o:#x}, config={self.config!r})"
+
+    def cell(self, position):
+        bit = 1 << position
+        if self.x & bit:
+            return PLAYER_X
+        if self.o & bit:
+            return PLAYER_O
+        return EMPTY
+
+    def pieces(self, player):
+        return self.x if player == PLAYER_X else self.o
+
+    def empty_mask(self):
+        return self.config.full_mask & ~(self.x | self.o)
+
+    def moves(self):
+        """Return the empty cells, lowest index first"""
+        return list(iter_bits(self.empty_mask()))
+
+    def piece_count(self):
+        return (self.x | self.o).bit_count()
+
+    def place(self, position, player):
+        if player == PLAYER_X:
+            self.x |= 1 << position
+        else:
+            self.o |= 1 << position
+
+    def remove(self, position):
+        mask = ~(1 << position)
+        self.x &= mask
+        self.o &= mask
+
+    def is_full(self):
+        return (self.x | self.o) == self.config.full_mask
+
+    def winner(self):
+        """Return 'X' or 'O' if someone has k in a row, else None"""
+        if self.config.has_won(self.x):
+            return PLAYER_X
+        if self.config.has_won(self.o):
+            return PLAYER_O
+        return None
+
+
+class GameState:
+    """Position with per-line piece counts, kept up to date move by move.
+
+    make() and unmake() only touch the lines through the cell they fill,
+    so the winner, a full board and the line-weight evaluation are O(1)
+    reads however large the board is.
+    """
+
+    __slots__ = ('config', 'x', 'o', 'to_move', 'x_counts', 'o_counts', 'score',
+                 'winner', 'winning_line', 'history')
+
+    def __init__(self, config=CLASSIC):
+        self.config = config
+        self.x = 0
+        self.o = 0
+        self.to_move = PLAYER_X
+        self.x_counts = [0] * len(config.win_masks)
+        self.o_counts = [0] * len(config.win_masks)
+        # Sum of line_weights over the lines only X holds, minus those only
+        # O holds: the heuristic evaluation from X's point of view
+        self.score = 0
+        self.winner = None
+        # Index into config.win_lines of the line that won
+        self.winning_line = None
+        # (cell, player, set_winner) per move, for unmake()
+        self.history = []
+
+    @classmethod
+    def from_position(cls, position, to_move=None):
+        """Build the counts for a Bitboard; X moves first on equal counts"""
+        state = cls(position.config)
+        for cell in iter_bits(position.x):
+            state.make(cell, PLAYER_X)
+        for cell in iter_bits(position.o):
+            state.make(cell, PLAYER_O)
+        state.history = []
+        if to_move is None:
+            to_move = PLAYER_X if position.x.bit_count() == position.o.bit_count() else PLAYER_O
+        state.to_move = to_move
+        return state
+
+    def copy(self):
+        clone = GameState.__new__(GameState)
+        clone.config = self.config
+        clone.x = self.x
+        clone.o = self.o
+        clone.to_move = self.to_move
+        clone.x_counts = self.x_counts[:]
+        clone.o_counts = self.o_counts[:]
+        clone.score = self.score
+        clone.winner = self.winner
+        clone.winning_line = self.winning_line
+        clone.history = self.history[:]
+        return clone
+
+    def __repr__(self):
+        return f"GameState(x={self.x:#x}, o={self.o:#x}, to_move={self.to_move!r})"
+
+    @property
+    def position(self):
+        return Bitboard(self.x, self.o, self.config)
+
+    def make(self, cell, player=None):
+        """Place a piece for player (default: the side to move).
+
+        Returns True if the piece completes a line.
+        """
+        if player is None:
+            player = self.to_move
+        bit = 1 << cell
+        if (self.x | self.o) & bit:
+            raise ValueError(f"Cell {cell} is already taken")
+        if player == PLAYER_X:
+            self.x |= bit
+            mine, theirs, sign = self.x_counts, self.o_counts, 1
+            self.to_move = PLAYER_O
+        else:
+            self.o |= bit
+            mine, theirs, sign = self.o_counts, self.x_counts, -1
+            self.to_move = PLAYER_X
+
+        config = self.config
+        deltas = config.line_deltas
+        win_length = config.win_length
+        delta = 0
+        won = None
+        for line in config.lines_by_cell[cell]:
+            n = mine[line]
+            delta += deltas[n][theirs[line]]
+            mine[line] = n + 1
+            if n + 1 == win_length:
+                won = line
+        self.score += sign * delta
+
+        set_winner = won is not None and self.winner is None
+        if set_winner:
+            self.winner = player
+            self.winning_line = won
+        self.history.append((cell, player, set_winner))
+        return won is not None
+
+    def unmake(self):
+        """Take back the last make()"""
+        cell, player, set_winner = self.history.pop()
+        bit = 1 << cell
+        if player == PLAYER_X:
+            self.x &= ~bit
+            mine, theirs, sign = self.x_counts, self.o_counts, 1
+        else:
+            self.o &= ~bit
+            mine, theirs, sign = self.o_counts, self.x_counts, -1
+        self.to_move = player
+
+        deltas = self.config.line_deltas
+        delta = 0
+        for line in self.config.lines_by_cell[cell]:
+            n = mine[line] - 1
+            mine[line] = n
+            delta += deltas[n][theirs[line]]
+        self.score -= sign * delta
+
+        if set_winner:
+            self.winner = None
+            self.winning_line = None
+
+    def pieces(self, player):
+        return self.x if player == PLAYER_X else self.o
+
+    def empty_mask(self):
+        return self.config.full_mask & ~(self.x | self.o)
+
+    def moves(self):
+        """Return the empty cells, lowest index first"""
+        return list(iter_bits(self.empty_mask()))
+
+    def is_full(self):
+        return (self.x | self.o) == self.config.full_mask
+
+
+class TicTacToeEngine:
+    """Pure game state plus the AI search"""
+
+    def __init__(self, config=CLASSIC, rng=None, tt_size=1 << 16):
+        self.rng = rng if rng is not None else random.Random()
+        # Exact scores stay valid across moves and games, so the table is
+        # only cleared when the board configuration changes
+        self.tt = TranspositionTable(tt_size)
+        self.config = config
+        self.nodes = 0
+        self.cutoffs = 0
+        self.max_ply = 0
+        self.deadline = None
+        # threading.Event (or anything with is_set) that aborts the search
+        self.stop_event = None
+        # Per-call SearchStats; see enable_instrumentation()
+        self.instrumented = False
+        self.last_search_stats = None
+        self.search_history = None
+        # Monte Carlo searcher, created by monte_carlo() on first use
+        self.mcts = None
+        # Persistent table cache, off until enable_cache(); cache_dir None
+        # means tic_tac_toe_cache's default directory. Neither the module
+        # nor the file is touched before the first search
+        self.use_cache = False
+        self.cache_dir = None
+        self.cache = None
+        # Opening books by config for get_ai_move, loaded on first use and
+        # shared with forks; book_dir None means tic_tac_toe_book's default
+        # directory
+        self.use_book = True
+        self.book_dir = None
+        self.books = {}
+        self.reset()
+
+    def enable_instrumentation(self, history=INSTRUMENTATION_HISTORY):
+        """Record a SearchStats for every get_best_move / search call"""
+        self.instrumented = True
+        self.search_history = deque(maxlen=history)
+
+    def disable_instrumentation(self):
+        self.instrumented = False
+        self.last_search_stats = None
+        self.search_history = None
+
+    def enable_cache(self, directory=None):
+        """Warm the transposition table from disk and keep it for next time"""
+        self.use_cache = True
+        self.cache_dir = directory
+        self.cache = None
+
+    def _open_cache(self):
+        if self.cache is None and self.use_cache:
+            from tic_tac_toe_cache import DEFAULT_CACHE_DIR, PersistentCache
+
+            self.cache = PersistentCache(self.config, self.cache_dir or DEFAULT_CACHE_DIR)
+        return self.cache
+
+    def warm_cache(self):
+        """Load the persistent cache into the table if it isn't yet"""
+        cache = self._open_cache()
+        if cache is not None and not cache.loaded:
+            cache.load_into(self.tt)
+
+    def save_cache(self, wait=False):
+        """Write the table's deep entries to the cache.
+
+        The write happens on a background thread unless wait is set.
+        """
+        if self.cache is None or not self.cache.loaded:
+            return
+        if wait:
+            self.cache.wait()
+            self.cache.save(self.tt)
+        else:
+            self.cache.save_async(self.tt)
+
+    def set_config(self, config):
+        """Switch board size / win length and start a fresh game"""
+        if config != self.config:
+            self.save_cache()
+            self.cache = None
+            self.config = config
+            # A fresh table rather than clear(), so a search still running
+            # on a fork can't write old-board entries into the new one
+            self.tt = TranspositionTable(self.tt.size)
+            self.mcts = None
+        self.reset()
+
+    def fork(self, difficulty=None):
+        """Copy of the game for searching on another thread.
+
+        The copy has its own position, RNG and search counters but shares
+        the transposition table, its persistent cache and the Monte Carlo
+        tree, so its work keeps warming this engine. The tree is only
+        created here for an 'mcts' fork; other forks share it if it exists.
+        """
+        if difficulty == 'mcts':
+            self.monte_carlo()
+        self._open_cache()
+        clone = copy.copy(self)
+        clone.state = self.state.copy()
+        clone.rng = random.Random(self.rng.getrandbits(64))
+        clone.nodes = 0
+        clone.deadline = None
+        clone.stop_event = None
+        clone.last_search_stats = None
+        if self.instrumented:
+            clone.search_history = deque(maxlen=self.search_history.maxlen)
+        return clone
+
+    def reset(self):
+        """Clear the board and give the first move to X"""
+        self.state = GameState(self.config)
+
+    @property
+    def position(self):
+        """Bitboard snapshot of the current position"""
+        return self.state.position
+
+    @position.setter
+    def position(self, position):
+        self.state = GameState.from_position(position)
+
+    @property
+    def current_player(self):
+        return self.state.to_move
+
+    @current_player.setter
+    def current_player(self, player):
+        self.state.to_move = player
+
+    @property
+    def board(self):
+        """Read-only list view of the board as ' '/'X'/'O' cells"""
+        return self.position.to_cells()
+
+    def play(self, position, player=None):
+        """Place a piece and hand the turn to the other player"""
+        self.state.make(position, player)
+
+    def is_board_full(self):
+        return self.state.is_full()
+
+    def get_available_moves(self):
+        return self.state.moves()
+
+    def check_winner(self):
+        """Return 'X' or 'O' if someone has k in a row, else None"""
+        return self.state.winner
+
+    def is_game_over(self):
+        return self.check_winner() is not None or self.is_board_full()
+
+    def game_result(self):
+        """WinResult once the game is over, else None; O(1) and side-effect free"""
+        state = self.state
+        if state.winner is not None:
+            return WinResult(state.winner, self.config.win_lines[state.winning_line])
+        if state.is_full():
+            return WinResult('draw')
+        return None
+
+    def check_interrupt(self):
+        """Raise if the search was cancelled or has run out of time"""
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchCancelled()
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+    def begin_search_stats(self):
+        """Reset the search counters; snapshot the clock when instrumented"""
+        self.nodes = 0
+        self.cutoffs = 0
+        self.max_ply = 0
+        if not self.instrumented:
+            return None
+        return time.perf_counter(), self.tt.hits, self.tt.hits + self.tt.misses
+
+    def end_search_stats(self, snapshot, kind, move, score, depth):
+        """Turn the counters since begin_search_stats() into a SearchStats"""
+        if snapshot is None:
+            return
+        started, tt_hits, tt_probes = snapshot
+        stats = SearchStats(
+            kind, move, score, depth, self.nodes, self.cutoffs,
+            self.tt.hits - tt_hits, self.tt.hits + self.tt.misses - tt_probes,
+            self.max_ply, (time.perf_counter() - started) * 1000
+        )
+        self.record_search_stats(stats)
+
+    def record_search_stats(self, stats):
+        """Keep a SearchStats as the latest, e.g. one returned by a fork"""
+        if self.search_history is None:
+            return
+        self.last_search_stats = stats
+        self.search_history.append(stats)
+
+    def negamax(self, state, alpha, beta, depth, ply=0):
+        """Alpha-beta score for state.to_move.
+
+        The caller guarantees nobody has won yet. Moves are played on the
+        GameState with make()/unmake(), whose per-line counts report a
+        completed line and keep the heuristic evaluation current, so
+        neither needs a scan of the board. At depth 0 the evaluation
+        stands in for the real score. Moves are tried in the board's
+        move_order so cutoffs come early.
+
+        ply is the distance from the root: a win made here scores
+        WIN_SCORE - ply, so faster wins and slower losses score higher.
+        Transposition table entries hold win scores relative to the node.
+        """
+        self.nodes += 1
+        if not self.nodes % DEADLINE_CHECK_INTERVAL:
+            self.check_interrupt()
+        if ply > self.max_ply:
+            self.max_ply = ply
+
+        config = self.config
+        if state.x | state.o == config.full_mask:
+            return 0
+
+        # Mate-distance pruning: nothing here scores better than winning on
+        # this move or worse than losing on the opponent's next one
+        alpha = max(alpha, ply + 1 - WIN_SCORE)
+        beta = min(beta, WIN_SCORE - ply)
+        if alpha >= beta:
+            return alpha
+
+        if state.to_move == PLAYER_X:
+            me, opp = state.x, state.o
+            if depth <= 0:
+                return state.score
+        else:
+            me, opp = state.o, state.x
+            if depth <= 0:
+                return -state.score
+
+        tt = self.tt
+        key = config.canonical_key(me, opp)
+        entry = tt.get(key)
+        if entry is not None and entry[2] >= depth:
+            value = score_from_tt(entry[0], ply)
+            flag = entry[1]
+            if flag == TranspositionTable.EXACT:
+                return value
+            if flag == TranspositionTable.LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alpha_orig = alpha
+        best = -math.inf
+        moves = config.candidate_moves(me, opp)
+        for cell in config.move_order:
+            if not moves >> cell & 1:
+                continue
+            if state.make(cell):
+                score = WIN_SCORE - ply
+            else:
+                score = -self.negamax(state, -beta, -alpha, depth - 1, ply + 1)
+            state.unmake()
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.cutoffs += 1
+                        break
+
+        if best <= alpha_orig:
+            flag = TranspositionTable.UPPER
+        elif best >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        tt.store(key, score_to_tt(best, ply), flag, depth)
+        return best
+
+    def minimax(self, depth, maximizing_player, alpha=-math.inf, beta=math.inf):
+        """Minimax score of the current position for O"""
+        winner = self.check_winner()
+
+        if winner == PLAYER_O:
+            return WIN_SCORE
+        elif winner == PLAYER_X:
+            return -WIN_SCORE
+        state = self.state.copy()
+        remaining = self.config.default_depth() - depth
+        if maximizing_player:
+            state.to_move = PLAYER_O
+            return self.negamax(state, alpha, beta, remaining)
+        state.to_move = PLAYER_X
+        return -self.negamax(state, -beta, -alpha, remaining)
+
+    def search_root(self, depth, first_move=None):
+        """Search the candidate moves at the root; return (move, score).
+
+        Moves are tried in the board's move_order, with first_move (usually
+        the best move of the previous iteration) ahead of the rest. Alpha is
+        carried from one root move to the next, so later moves only have to
+        prove they can't beat the best so far (mate-distance pruning makes
+        that cheap once a win is known). A win on the move is returned
+        without searching. The moves are played on a copy of the game
+        state, so an interrupted search leaves the game untouched.
+        """
+        config = self.config
+        best_score = -math.inf
+        best_move = None
+        state = self.state.copy()
+        me = state.pieces(state.to_move)
+        opp = state.pieces(other_player(state.to_move))
+
+        candidates = config.candidate_moves(me, opp)
+        for move in iter_bits(candidates):
+            if config.completes_line(me | 1 << move, 1 << move):
+                # Nothing beats winning on the move
+                return move, WIN_SCORE
+
+        moves = [move for move in config.move_order if candidates >> move & 1]
+        if first_move in moves:
+            moves.remove(first_move)
+            moves.insert(0, first_move)
+
+        for move in moves:
+            state.make(move)
+            score = -self.negamax(state, -math.inf, -best_score, depth - 1, 1)
+            state.unmake()
+            if score > best_score:
+                best_score = score
+                best_move = move
+
+        return best_move, best_score
+
+    def book_move(self):
+        """Move from the opening book for this board, or None if out of book"""
+        if not self.use_book:
+            return None
+        book = self.books.get(self.config)
+        if book is None:
+            from tic_tac_toe_book import DEFAULT_BOOK_DIR, load_book
+
+            book = load_book(self.config, self.book_dir or DEFAULT_BOOK_DIR)
+            self.books[self.config] = book
+        state = self.state
+        return book.lookup(state.pieces(state.to_move), state.pieces(other_player(state.to_move)))
+
+    def get_best_move(self, depth=None):
+        """Get best move for the player to move using minimax"""
+        if depth is None:
+            depth = self.config.default_depth()
+        self.warm_cache()
+        self.deadline = None
+        snapshot = self.begin_search_stats()
+        move, score = self.search_root(depth)
+        self.end_search_stats(snapshot, 'get_best_move', move, score, depth)
+        return move
+
+    def search(self, time_budget_ms=None, max_depth=None):
+        """Iterative deepening: search depth 1, 2, ... until the budget runs out.
+
+        Returns a SearchResult for the deepest iteration that completed. The
+        first iteration always runs to completion so there is a move to play.
+        Without a time budget the search stops at the board's default depth.
+        """
+        start = time.perf_counter()
+        empties = self.state.empty_mask().bit_count()
+        if max_depth is None:
+            max_depth = empties if time_budget_ms is not None else self.config.default_depth()
+        max_depth = min(max_depth, empties)
+
+        self.warm_cache()
+        snapshot = self.begin_search_stats()
+        self.deadline = None
+        result = SearchResult(None, 0, 0, 0, 0.0)
+        try:
+            for depth in range(1, max_depth + 1):
+                move, score = self.search_root(depth, result.move)
+                result = SearchResult(move, score, depth, self.nodes,
+                                      (time.perf_counter() - start) * 1000)
+                if abs(score) > WIN_THRESHOLD:
+                    # Proven result: deeper iterations can't change it
+                    break
+                if time_budget_ms is not None:
+                    self.deadline = start + time_budget_ms / 1000
+                    if time.perf_counter() > self.deadline:
+                        break
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+
+        result.nodes = self.nodes
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        self.end_search_stats(snapshot, 'search', result.move, result.score, result.depth)
+        return result
+
+    def get_optimal_move(self, time_budget_ms=None):
+        """Look the move up in the perfect-play table or the opening book,
+        searching as a fallback"""
+        if self.config.is_classic and self.check_winner() is None:
+            # Imported here so the table module (and file) stay untouched
+            # until the AI actually needs a move
+            from tic_tac_toe_solution import get_table
+
+            entry = get_table().lookup(self.state.x, self.state.o)
+            if entry is not None:
+                return entry[1][0]
+        snapshot = self.begin_search_stats()
+        move = self.book_move()
+        if move is not None:
+            self.end_search_stats(snapshot, 'book', move, 0, 0)
+            return move
+        if time_budget_ms is None:
+            return self.get_best_move()
+        return self.search(time_budget_ms).move
+
+    def get_shallow_move(self, max_depth, time_budget_ms=None):
+        """Best move from a search that never looks past max_depth.
+
+        The search runs on a scratch table, so entries left by deeper
+        searches (or the persistent cache) can't extend its horizon.
+        """
+        # Loaded into the shared table now; the scratch one would swallow it
+        self.warm_cache()
+        shared, self.tt = self.tt, TranspositionTable(SHALLOW_TT_SIZE)
+        try:
+            return self.search(time_budget_ms, max_depth).move
+        finally:
+            self.tt = shared
+
+    def monte_carlo(self):
+        """The engine's MCTS searcher, created on first use"""
+        if self.mcts is None:
+            # Imported here: tic_tac_toe_mcts builds on this module
+            from tic_tac_toe_mcts import MonteCarloSearch
+
+            self.mcts = MonteCarloSearch(self.config, random.Random(self.rng.getrandbits(64)))
+        return self.mcts
+
+    def get_mcts_move(self, iterations=MCTS_PLAYOUTS, time_budget_ms=None):
+        """Pick a move by Monte Carlo Tree Search.
+
+        The tree carries over between calls in the same game, so the
+        playouts spent on earlier moves keep paying off.
+        """
+        searcher = self.monte_carlo()
+        snapshot = self.begin_search_stats()
+        move = searcher.search(self.state, iterations, time_budget_ms, self.stop_event)
+        self.nodes = searcher.iterations
+        self.max_ply = searcher.max_depth
+        if snapshot is not None:
+            score = searcher.move_values().get(move, (0, 0.0))[1]
+            self.end_search_stats(snapshot, 'mcts', move, score, searcher.max_depth)
+        return move
+
+    def get_random_move(self):
+        """Get random move for easy AI"""
+        available = self.get_available_moves()
+        return self.rng.choice(available) if available else None
+
+    def get_ai_move(self, difficulty):
+        """Pick a move for the given difficulty level"""
+        if difficulty == 'easy':
+            return self.get_random_move()
+        budget = SEARCH_TIME_BUDGET_MS[difficulty]
+        if difficulty == 'mcts':
+            return self.get_mcts_move(MCTS_PLAYOUTS, budget)
+        if difficulty == 'medium':
+            if self.rng.random() < MEDIUM_RANDOM_RATE:
+                return self.get_random_move()
+            return self.get_shallow_move(MEDIUM_MAX_DEPTH, budget)
+        return self.get_optimal_move(budget)
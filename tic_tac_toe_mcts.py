@@ -0,0 +1,227 @@
+"""Monte Carlo Tree Search (UCT) player.
+
+Exact search stops scaling past small boards; MCTS instead plays random
+games from the position and grows a tree towards the moves that win
+them, so its strength follows the playout budget on any board size:
+
+    python tic_tac_toe_mcts.py --size 5 --win-length 4 --iterations 5000
+
+The tree is kept between calls and re-rooted at the new position when
+it is reached from the old one, so playouts spent on the opponent's
+reply carry over to the next move of the same game.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+
+from tic_tac_toe_engine import (
+    CLASSIC, PLAYER_O, PLAYER_X, GameState, SearchCancelled, board_config, iter_bits,
+    other_player
+)
+
+# UCT exploration constant (sqrt 2 suits rewards in [0, 1])
+EXPLORATION = math.sqrt(2)
+
+# Playouts between looks at the clock and the stop event
+CHECK_INTERVAL = 64
+
+DRAW = 'draw'
+
+
+class Node:
+    """Tree node for the position reached by playing move.
+
+    wins is the total reward (1 per win, 0.5 per draw) from the point of
+    view of player, the side that played move.
+    """
+
+    __slots__ = ('move', 'parent', 'player', 'children', 'untried', 'result', 'visits', 'wins')
+
+    def __init__(self, move, parent, player, untried, result=None):
+        self.move = move
+        self.parent = parent
+        self.player = player
+        self.children = []
+        self.untried = untried
+        # 'X', 'O' or DRAW if the game is over at this node
+        self.result = result
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        """UCT: the child with the best mean reward plus exploration bonus"""
+        scale = exploration * math.sqrt(math.log(self.visits))
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + scale / math.sqrt(child.visits))
+
+
+class MonteCarloSearch:
+    """UCT search over GameStates of one board configuration"""
+
+    def __init__(self, config=CLASSIC, rng=None, exploration=EXPLORATION):
+        self.config = config
+        self.rng = rng if rng is not None else random.Random()
+        self.exploration = exploration
+        self.root = None
+        self.root_x = 0
+        self.root_o = 0
+        # Figures for the last search()
+        self.iterations = 0
+        self.max_depth = 0
+
+    def reset(self):
+        """Forget the tree, e.g. when a new game starts"""
+        self.root = None
+
+    def _untried(self, state):
+        moves = list(iter_bits(self.config.candidate_moves(state.x, state.o)))
+        self.rng.shuffle(moves)
+        return moves
+
+    def _root_for(self, state):
+        """Re-root the stored tree at state if it was reached from it"""
+        root = self.root
+        self.root = None
+        if (root is not None and root.result is None
+                and not self.root_x & ~state.x and not self.root_o & ~state.o):
+            node = root
+            x, o = self.root_x, self.root_o
+            while node is not None and (x, o) != (state.x, state.o):
+                for child in node.children:
+                    bit = 1 << child.move
+                    if child.player == PLAYER_X and state.x & bit and not x & bit:
+                        x |= bit
+                        break
+                    if child.player == PLAYER_O and state.o & bit and not o & bit:
+                        o |= bit
+                        break
+                else:
+                    child = None
+                node = child
+            if node is not None and node.result is None and node.player != state.to_move:
+                node.parent = None
+                return node
+        return Node(None, None, other_player(state.to_move), self._untried(state))
+
+    def search(self, state, iterations=None, time_budget_ms=None, stop_event=None):
+        """Run playouts from state and return the most visited move.
+
+        Stops after iterations playouts or time_budget_ms milliseconds,
+        whichever comes first (at least one of them must be given, and
+        positive). Raises SearchCancelled if stop_event gets set.
+        """
+        if iterations is None and time_budget_ms is None:
+            raise ValueError("MCTS needs an iteration or time budget")
+        if iterations is not None and iterations < 1:
+            raise ValueError(f"MCTS needs at least one iteration, not {iterations}")
+        if time_budget_ms is not None and time_budget_ms <= 0:
+            raise ValueError(f"MCTS time budget must be positive, not {time_budget_ms}")
+        if state.winner is not None or state.is_full():
+            return None
+
+        start = time.perf_counter()
+        deadline = None if time_budget_ms is None else start + time_budget_ms / 1000
+        root = self._root_for(state)
+        sim = state.copy()
+        rng = self.rng
+        exploration = self.exploration
+        full_mask = self.config.full_mask
+        max_depth = 0
+
+        count = 0
+        while iterations is None or count < iterations:
+            if not count % CHECK_INTERVAL:
+                if stop_event is not None and stop_event.is_set():
+                    raise SearchCancelled()
+                if deadline is not None and count and time.perf_counter() > deadline:
+                    break
+            count += 1
+
+            # Selection
+            node = root
+            made = 0
+            while not node.untried and node.children:
+                node = node.select_child(exploration)
+                sim.make(node.move)
+                made += 1
+
+            # Expansion
+            if node.untried:
+                move = node.untried.pop()
+                player = sim.to_move
+                if sim.make(move):
+                    child = Node(move, node, player, [], player)
+                elif sim.x | sim.o == full_mask:
+                    child = Node(move, node, player, [], DRAW)
+                else:
+                    child = Node(move, node, player, self._untried(sim))
+                made += 1
+                node.children.append(child)
+                node = child
+            if made > max_depth:
+                max_depth = made
+
+            # Rollout: random moves until someone wins or the board fills
+            result = node.result
+            if result is None:
+                empty = list(iter_bits(full_mask & ~(sim.x | sim.o)))
+                rng.shuffle(empty)
+                result = DRAW
+                for cell in empty:
+                    player = sim.to_move
+                    made += 1
+                    if sim.make(cell):
+                        result = player
+                        break
+            for _ in range(made):
+                sim.unmake()
+
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                if result == node.player:
+                    node.wins += 1
+                elif result == DRAW:
+                    node.wins += 0.5
+                node = node.parent
+
+        self.root = root
+        self.root_x, self.root_o = state.x, state.o
+        self.iterations = count
+        self.max_depth = max_depth
+        best = max(root.children, key=lambda child: child.visits)
+        return best.move
+
+    def move_values(self):
+        """{move: (visits, mean reward)} for the children of the current root"""
+        if self.root is None:
+            return {}
+        return {child.move: (child.visits, child.wins / child.visits)
+                for child in self.root.children}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run one MCTS move from the empty board")
+    parser.add_argument('--size', type=int, default=3, help="board size (default 3)")
+    parser.add_argument('--win-length', type=int, default=None, help="pieces in a row to win")
+    parser.add_argument('--iterations', type=int, default=None, help="playout budget")
+    parser.add_argument('--time-ms', type=float, default=None, help="time budget in milliseconds")
+    parser.add_argument('--seed', type=int, default=None, help="RNG seed for reproducible runs")
+    args = parser.parse_args(argv)
+
+    config = board_config(args.size, args.win_length or args.size)
+    searcher = MonteCarloSearch(config, random.Random(args.seed))
+    iterations = args.iterations if args.iterations or args.time_ms else 10000
+    start = time.perf_counter()
+    move = searcher.search(GameState(config), iterations, args.time_ms)
+    elapsed = time.perf_counter() - start
+    print(f"{config.name}: move {move} after {searcher.iterations} playouts in "
+          f"{elapsed * 1000:.0f} ms ({searcher.iterations / elapsed:,.0f} playouts/s), "
+          f"tree depth {searcher.max_depth}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
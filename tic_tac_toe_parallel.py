@@ -0,0 +1,246 @@
+"""Search one position on several CPU cores.
+
+Two modes, both on a process pool:
+
+- Root splitting for alpha-beta: the first root move is searched alone
+  to get a bound, then the other root moves are searched in parallel
+  against it (young brothers wait). The deep transposition table entries
+  each worker finds are merged back into the calling engine's table.
+- Root-parallel MCTS: every worker grows its own tree from the position
+  with a share of the playouts, and the root visit counts are summed.
+
+Each task starts from an empty table and its own seed, so the chosen move
+does not depend on how tasks land on workers. The serial get_best_move()
+is untouched. Run the module for a speedup report:
+
+    python tic_tac_toe_parallel.py --size 4 --depth 5 --workers 1 2 4
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tic_tac_toe_engine import (
+    MCTS_PLAYOUTS, WIN_SCORE, Bitboard, GameState, SearchResult, TicTacToeEngine,
+    board_config, iter_bits, other_player
+)
+from tic_tac_toe_mcts import MonteCarloSearch
+
+# Only entries searched at least this deep are worth shipping back
+MERGE_MIN_DEPTH = 2
+
+# Table slots per worker engine: each task only searches one root move,
+# and the table is cleared and scanned for every task
+WORKER_TT_SIZE = 1 << 13
+
+# One engine per board configuration in each worker process
+_worker_engines = {}
+
+
+def _worker_engine(size, win_length):
+    key = (size, win_length)
+    if key not in _worker_engines:
+        _worker_engines[key] = TicTacToeEngine(board_config(size, win_length),
+                                                  tt_size=WORKER_TT_SIZE)
+    return _worker_engines[key]
+
+
+def _task_state(config, x, o, to_move):
+    return GameState.from_position(Bitboard(x, o, config), to_move)
+
+
+def search_root_move(task):
+    """Worker entry point: score one root move against the bound alpha.
+
+    The table starts from seed, the caller's deep entries. The score is
+    exact when it beats alpha and an upper bound otherwise. Returns (move,
+    score, nodes, deep transposition table entries).
+    """
+    size, win_length, x, o, to_move, move, depth, alpha, seed = task
+    engine = _worker_engine(size, win_length)
+    engine.tt.clear()
+    engine.tt.merge(seed)
+    engine.nodes = 0
+    state = _task_state(engine.config, x, o, to_move)
+    state.make(move)
+    score = -engine.negamax(state, -math.inf, -alpha, depth - 1, 1)
+    return move, score, engine.nodes, engine.tt.items(MERGE_MIN_DEPTH)
+
+
+def run_playouts(task):
+    """Worker entry point: grow an MCTS tree; return (root stats, playouts, depth)"""
+    size, win_length, x, o, to_move, iterations, seed = task
+    config = board_config(size, win_length)
+    searcher = MonteCarloSearch(config, random.Random(seed))
+    searcher.search(_task_state(config, x, o, to_move), iterations)
+    return searcher.move_values(), searcher.iterations, searcher.max_depth
+
+
+class ParallelSearch:
+    """Process pool for searching single positions; use as a context manager.
+
+    workers=1 runs every task in this process, which gives the serial
+    baseline for speedup measurements.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def map(self, fn, tasks):
+        if self.workers == 1:
+            return list(map(fn, tasks))
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        return list(self.pool.map(fn, tasks))
+
+    def best_move(self, engine, depth=None):
+        """Alpha-beta with the root moves split over the pool; returns a SearchResult.
+
+        Only moves that beat the first move's score get exact scores, and
+        ties go to the earliest move in the board's move_order, so the move
+        is the one the serial search picks.
+        """
+        config = engine.config
+        if depth is None:
+            depth = config.default_depth()
+        start = time.perf_counter()
+        state = engine.state
+        me = state.pieces(state.to_move)
+        opp = state.pieces(other_player(state.to_move))
+        candidates = config.candidate_moves(me, opp)
+
+        for move in iter_bits(candidates):
+            if config.completes_line(me | 1 << move, 1 << move):
+                return SearchResult(move, WIN_SCORE, depth, 0, (time.perf_counter() - start) * 1000)
+
+        # A root move that is a mirror image of an earlier one scores the
+        # same and can't beat it, so only one move per symmetry class is searched
+        moves = []
+        seen = set()
+        for move in config.move_order:
+            if candidates >> move & 1:
+                key = config.canonical_key(me | 1 << move, opp)
+                if key not in seen:
+                    seen.add(key)
+                    moves.append(move)
+
+        position = (config.size, config.win_length, state.x, state.o, state.to_move)
+        best_move = None
+        best_score = -math.inf
+        nodes = 0
+        for batch in (moves[:1], moves[1:]):
+            seed = engine.tt.items(MERGE_MIN_DEPTH)
+            tasks = [position + (move, depth, best_score, seed) for move in batch]
+            for move, score, task_nodes, entries in self.map(search_root_move, tasks):
+                nodes += task_nodes
+                engine.tt.merge(entries)
+                if score > best_score:
+                    best_move, best_score = move, score
+        return SearchResult(best_move, best_score, depth, nodes, (time.perf_counter() - start) * 1000)
+
+    def mcts_move(self, engine, iterations=MCTS_PLAYOUTS, seed=0):
+        """Root-parallel MCTS: split the playouts, sum the root visits; returns a SearchResult"""
+        config = engine.config
+        state = engine.state
+        start = time.perf_counter()
+        share = -(-iterations // self.workers)
+        tasks = [(config.size, config.win_length, state.x, state.o, state.to_move, share,
+                  f"{seed}:{index}") for index in range(self.workers)]
+
+        visits = {}
+        wins = {}
+        playouts = 0
+        max_depth = 0
+        for values, task_playouts, task_depth in self.map(run_playouts, tasks):
+            playouts += task_playouts
+            max_depth = max(max_depth, task_depth)
+            for move, (move_visits, mean) in values.items():
+                visits[move] = visits.get(move, 0) + move_visits
+                wins[move] = wins.get(move, 0.0) + mean * move_visits
+        if not visits:
+            return SearchResult(None, 0, 0, 0, (time.perf_counter() - start) * 1000)
+        move = max(sorted(visits), key=visits.get)
+        return SearchResult(move, wins[move] / visits[move], max_depth, playouts,
+                            (time.perf_counter() - start) * 1000)
+
+
+def measure_speedup(config, opening, worker_counts, depth=None, iterations=MCTS_PLAYOUTS):
+    """Time both parallel modes at each worker count.
+
+    Yields (workers, alpha-beta SearchResult, speedup, MCTS SearchResult,
+    speedup). Speedups are against the serial get_best_move and a one-worker
+    MCTS run, whatever worker counts are asked for. Each mode runs once
+    untimed first, so pool start-up and the per-worker engines are not
+    counted.
+    """
+    def fresh_engine():
+        engine = TicTacToeEngine(config)
+        for move in opening:
+            engine.play(move)
+        return engine
+
+    start = time.perf_counter()
+    fresh_engine().get_best_move(depth)
+    serial_ms = (time.perf_counter() - start) * 1000
+    with ParallelSearch(1) as serial:
+        serial.mcts_move(fresh_engine(), 1)
+        mcts_serial_ms = serial.mcts_move(fresh_engine(), iterations).elapsed_ms
+
+    for workers in worker_counts:
+        with ParallelSearch(workers) as parallel:
+            parallel.best_move(fresh_engine(), depth)
+            result = parallel.best_move(fresh_engine(), depth)
+            parallel.mcts_move(fresh_engine(), workers)
+            mcts = parallel.mcts_move(fresh_engine(), iterations)
+        yield workers, result, serial_ms / result.elapsed_ms, mcts, mcts_serial_ms / mcts.elapsed_ms
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel search speedup report")
+    parser.add_argument('--size', type=int, default=4, help="board size (default 4)")
+    parser.add_argument('--win-length', type=int, default=None, help="pieces in a row to win")
+    parser.add_argument('--depth', type=int, default=None, help="alpha-beta depth (default: board default)")
+    parser.add_argument('--iterations', type=int, default=MCTS_PLAYOUTS,
+                        help=f"MCTS playouts (default {MCTS_PLAYOUTS})")
+    parser.add_argument('--opening', type=int, nargs='*', default=[],
+                        help="moves played before searching")
+    parser.add_argument('--workers', type=int, nargs='*', default=None,
+                        help="worker counts to measure (default: 1, 2, 4, ... up to all cores)")
+    args = parser.parse_args(argv)
+
+    config = board_config(args.size, args.win_length or args.size)
+    counts = args.workers
+    if not counts:
+        cores = os.cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= cores:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cores:
+            counts.append(cores)
+
+    print(f"{config.name}, {os.cpu_count()} cores available")
+    for workers, result, speedup, mcts, mcts_speedup in measure_speedup(
+            config, args.opening, counts, args.depth, args.iterations):
+        print(f"{workers:3d} workers: alpha-beta move {result.move} in {result.elapsed_ms:8.1f} ms "
+              f"({result.nodes} nodes, speedup {speedup:.2f}x); "
+              f"MCTS move {mcts.move} in {mcts.elapsed_ms:8.1f} ms (speedup {mcts_speedup:.2f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Headless AI-vs-AI self-play.
+
+Plays batches of games between any two strategies and streams the results,
+so a million-game run needs no more memory than a single game:
+
+    python tic_tac_toe_simulator.py hard easy --games 100000 --seed 1
+
+Useful for checking that the difficulty levels are ordered the way they
+should be and that the perfect player never loses.
+"""
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+
+from tic_tac_toe_engine import (
+    CLASSIC, PLAYER_O, PLAYER_X, SessionStats, TicTacToeEngine, board_config
+)
+
+# Strategy name -> function(engine) returning the move for the side to move
+STRATEGIES = {
+    'easy': lambda engine: engine.get_random_move(),
+    'medium': lambda engine: engine.get_ai_move('medium'),
+    'hard': lambda engine: engine.get_ai_move('hard'),
+    'mcts': lambda engine: engine.get_ai_move('mcts'),
+    'minimax': lambda engine: engine.get_best_move(),
+}
+
+GameResult = namedtuple('GameResult', ['winner', 'moves', 'elapsed'])
+
+
+def play_game(engine, x_strategy, o_strategy):
+    """Play one game from the empty board; return a GameResult.
+
+    winner is 'X', 'O' or 'draw'.
+    """
+    strategies = {PLAYER_X: STRATEGIES[x_strategy], PLAYER_O: STRATEGIES[o_strategy]}
+    start = time.perf_counter()
+    engine.reset()
+    moves = 0
+    while True:
+        engine.play(strategies[engine.current_player](engine))
+        moves += 1
+        result = engine.game_result()
+        if result is not None:
+            return GameResult(result.winner, moves, time.perf_counter() - start)
+
+
+def simulate(x_strategy, o_strategy, games, seed=None, config=CLASSIC, cache_dir=None,
+             save_cache=True):
+    """Yield a GameResult for each of games self-play games.
+
+    With cache_dir the engine starts from the persistent table cache there,
+    and writes back what it learned at the end unless save_cache is off.
+    """
+    for name in (x_strategy, o_strategy):
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {name}")
+    engine = TicTacToeEngine(config, rng=random.Random(seed))
+    if cache_dir is not None:
+        engine.enable_cache(cache_dir)
+    for _ in range(games):
+        yield play_game(engine, x_strategy, o_strategy)
+    if save_cache:
+        engine.save_cache(wait=True)
+
+
+class BatchStats:
+    """Running totals over a stream of GameResults"""
+
+    def __init__(self):
+        self.games = 0
+        self.x_wins = 0
+        self.o_wins = 0
+        self.draws = 0
+        self.total_moves = 0
+        self.elapsed = 0.0
+
+    def add(self, result):
+        self.games += 1
+        if result.winner == PLAYER_X:
+            self.x_wins += 1
+        elif result.winner == PLAYER_O:
+            self.o_wins += 1
+        else:
+            self.draws += 1
+        self.total_moves += result.moves
+        self.elapsed += result.elapsed
+
+    def merge(self, other):
+        """Fold another BatchStats into this one"""
+        self.games += other.games
+        self.x_wins += other.x_wins
+        self.o_wins += other.o_wins
+        self.draws += other.draws
+        self.total_moves += other.total_moves
+        self.elapsed += other.elapsed
+
+    def session_stats(self):
+        """The same tally as SessionStats (player = X, opponent = O)"""
+        stats = SessionStats()
+        stats.game_count = self.games
+        stats.scores = {'player': self.x_wins, 'opponent': self.o_wins, 'draw': self.draws}
+        return stats
+
+    @property
+    def average_length(self):
+        return self.total_moves / self.games if self.games else 0.0
+
+    @property
+    def moves_per_second(self):
+        return self.total_moves / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'games': self.games,
+            'x_wins': self.x_wins,
+            'o_wins': self.o_wins,
+            'draws': self.draws,
+            'average_length': self.average_length,
+            'moves_per_second': self.moves_per_second,
+        }
+
+    def __str__(self):
+        return (f"{self.games} games: X {self.x_wins} / O {self.o_wins} / draw {self.draws}, "
+                f"avg length {self.average_length:.2f}, {self.moves_per_second:,.0f} moves/s")
+
+
+def summarize(results):
+    """Consume a stream of GameResults into a BatchStats"""
+    stats = BatchStats()
+    for result in results:
+        stats.add(result)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless AI-vs-AI Tic-Tac-Toe simulator")
+    parser.add_argument('x_strategy', choices=sorted(STRATEGIES), help="strategy playing X")
+    parser.add_argument('o_strategy', choices=sorted(STRATEGIES), help="strategy playing O")
+    parser.add_argument('--games', type=int, default=1000, help="number of games (default 1000)")
+    parser.add_argument('--seed', type=int, default=None, help="RNG seed for reproducible runs")
+    parser.add_argument('--size', type=int, default=3, help="board size (default 3)")
+    parser.add_argument('--win-length', type=int, default=None, help="pieces in a row to win")
+    parser.add_argument('--cache-dir', default=None,
+                        help="start from and update the persistent AI cache in this directory")
+    args = parser.parse_args(argv)
+
+    config = board_config(args.size, args.win_length or args.size)
+    stats = summarize(simulate(args.x_strategy, args.o_strategy, args.games, args.seed, config,
+                               args.cache_dir))
+    print(f"{args.x_strategy} (X) vs {args.o_strategy} (O) on {config.name}: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Precomputed perfect-play table for the 3x3 game.
+
+Every position reachable from the empty board is solved once and written
+to a compact file: one little-endian uint16 per base-3 board index. Each
+entry holds the game value for the side to move and the set of cells that
+reach it soonest (fastest win, slowest loss). The table is memory-mapped
+the first time the AI asks for it, so a hard-mode move becomes a single
+lookup.
+
+Run this module to (re)generate and verify the table:
+
+    python tic_tac_toe_solution.py
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+
+from tic_tac_toe_cache import write_atomic
+from tic_tac_toe_engine import (
+    CLASSIC, WIN_SCORE, Bitboard, GameState, TicTacToeEngine, iter_bits
+)
+
+FULL_MASK = CLASSIC.full_mask
+
+MAGIC = b'TTT3'
+# Version 2: best moves are depth-aware (fastest win, slowest loss)
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHH')
+ENTRY = struct.Struct('<H')
+
+TABLE_SIZE = 3 ** 9
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'perfect_play_3x3.bin'
+)
+
+# Entry layout: bits 0-8 best-move mask, bits 9-10 value code, bit 15 set
+# for solved positions. Value codes are from the side to move's view.
+MOVES_MASK = FULL_MASK
+VALUE_SHIFT = 9
+VALID_BIT = 1 << 15
+VALUE_CODES = {-1: 0, 0: 1, 1: 2}
+CODE_VALUES = {code: value for value, code in VALUE_CODES.items()}
+
+# Base-3 weight of every 9-bit mask, so an index costs two table reads
+_BASE3 = tuple(sum(3 ** i for i in iter_bits(mask)) for mask in range(FULL_MASK + 1))
+
+
+def board_index(x, o):
+    """Base-3 index of a position: X cells count 1, O cells count 2"""
+    return _BASE3[x] + 2 * _BASE3[o]
+
+
+def solve_all():
+    """Solve every reachable non-terminal position.
+
+    Returns {(x, o): (value, best_moves_mask)} with value from the point of
+    view of the side to move (X when both have the same number of pieces).
+    best_moves_mask only holds the moves that win fastest, or lose slowest.
+    """
+    solved = {}
+    scores = {}
+
+    def solve(me, opp, x_to_move):
+        # Depth-aware score: winning on the move scores cells + 1, and every
+        # extra ply to the result moves the score one step towards 0
+        key = (me, opp) if x_to_move else (opp, me)
+        if key in scores:
+            return scores[key]
+        empty = FULL_MASK & ~(me | opp)
+        if not empty:
+            return 0
+
+        best = -math.inf
+        best_moves = 0
+        for move in iter_bits(empty):
+            bit = 1 << move
+            placed = me | bit
+            if CLASSIC.completes_line(placed, bit):
+                score = CLASSIC.cells + 1
+            elif placed | opp == FULL_MASK:
+                score = 0
+            else:
+                score = -solve(opp, placed, not x_to_move)
+                score -= (score > 0) - (score < 0)
+            if score > best:
+                best = score
+                best_moves = bit
+            elif score == best:
+                best_moves |= bit
+
+        scores[key] = best
+        solved[key] = ((best > 0) - (best < 0), best_moves)
+        return best
+
+    solve(0, 0, True)
+    return solved
+
+
+def encode_table(solved):
+    """Pack solved positions into the on-disk byte layout"""
+    entries = [0] * TABLE_SIZE
+    for (x, o), (value, moves) in solved.items():
+        entries[board_index(x, o)] = VALID_BIT | VALUE_CODES[value] << VALUE_SHIFT | moves
+    return HEADER.pack(MAGIC, FORMAT_VERSION, 0) + struct.pack(f'<{TABLE_SIZE}H', *entries)
+
+
+def write_table(path=DEFAULT_TABLE_PATH):
+    """Solve the game and atomically write the table to path"""
+    write_atomic(path, encode_table(solve_all()))
+    return path
+
+
+class PerfectPlayTable:
+    """Read-only view over an encoded table (mmap or bytes)"""
+
+    def __init__(self, buffer):
+        magic, version, _ = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a perfect-play table or wrong format version")
+        if len(buffer) != HEADER.size + TABLE_SIZE * ENTRY.size:
+            raise ValueError("Perfect-play table has the wrong size")
+        self.buffer = buffer
+
+    def lookup(self, x, o):
+        """Return (value, best_moves) for the side to move, or None"""
+        (entry,) = ENTRY.unpack_from(self.buffer, HEADER.size + board_index(x, o) * ENTRY.size)
+        if not entry & VALID_BIT:
+            return None
+        value = CODE_VALUES[entry >> VALUE_SHIFT & 3]
+        return value, list(iter_bits(entry & MOVES_MASK))
+
+
+def _map_table(path):
+    with open(path, 'rb') as f:
+        return PerfectPlayTable(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def open_table(path=DEFAULT_TABLE_PATH):
+    """Memory-map the table at path, generating it first if it is missing.
+
+    A stale or corrupt file is rebuilt once. If the file can't be read or
+    written, the table is built in memory instead.
+    """
+    try:
+        if not os.path.exists(path):
+            write_table(path)
+        try:
+            return _map_table(path)
+        except ValueError:
+            write_table(path)
+            return _map_table(path)
+    except (OSError, ValueError):
+        return PerfectPlayTable(encode_table(solve_all()))
+
+
+_table = None
+
+
+def get_table():
+    """Return the shared table, loading it on first use"""
+    global _table
+    if _table is None:
+        _table = open_table()
+    return _table
+
+
+def verify_table(table):
+    """Check every entry against a fresh minimax search; return mismatches.
+
+    Both the value and the depth-aware score of every listed best move
+    must agree with the engine.
+    """
+    engine = TicTacToeEngine()
+    mismatches = []
+    for x, o in solve_all():
+        looked_up = table.lookup(x, o)
+        if looked_up is None or CLASSIC.has_won(x) or CLASSIC.has_won(o):
+            mismatches.append((x, o))
+            continue
+        state = GameState.from_position(Bitboard(x, o))
+        score = engine.negamax(state, -math.inf, math.inf, CLASSIC.cells)
+        if (score > 0) - (score < 0) != looked_up[0]:
+            mismatches.append((x, o))
+            continue
+        for move in looked_up[1]:
+            if state.make(move):
+                move_score = WIN_SCORE
+            else:
+                move_score = -engine.negamax(state, -math.inf, math.inf, CLASSIC.cells, 1)
+            state.unmake()
+            if move_score != score:
+                mismatches.append((x, o))
+                break
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and verify the 3x3 perfect-play table")
+    parser.add_argument('--output', default=DEFAULT_TABLE_PATH,
+                        help="table file (default: perfect_play_3x3.bin next to this module)")
+    args = parser.parse_args(argv)
+
+    path = args.output
+    write_table(path)
+    table = open_table(path)
+    mismatches = verify_table(table)
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes), {len(mismatches)} mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Parallel AI tournament runner.
+
+Every ordered pairing of the chosen strategies plays a batch of games. The
+batches are cut into shards and spread over a process pool. Each shard
+seeds its own RNG from (seed, pairing, shard index), so a run gives the
+same numbers whatever the number of workers:
+
+    python tic_tac_toe_tournament.py --games 20000 --workers 8 --seed 1
+    python tic_tac_toe_tournament.py --games 5000 --scaling
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tic_tac_toe_engine import CLASSIC, SessionStats, board_config
+from tic_tac_toe_simulator import STRATEGIES, BatchStats, simulate, summarize
+
+DEFAULT_STRATEGIES = ('easy', 'medium', 'hard')
+DEFAULT_SHARD_SIZE = 250
+
+
+def play_shard(task):
+    """Worker entry point: play one shard and return (pairing, BatchStats).
+
+    Shards only read the persistent cache; concurrent writers would just
+    overwrite each other.
+    """
+    x_strategy, o_strategy, games, seed, size, win_length, cache_dir = task
+    config = board_config(size, win_length)
+    results = simulate(x_strategy, o_strategy, games, seed, config, cache_dir, save_cache=False)
+    return (x_strategy, o_strategy), summarize(results)
+
+
+def shard_tasks(strategies, games, seed, shard_size, config, cache_dir=None):
+    """Split games per ordered pairing into picklable shard tasks"""
+    for x_strategy, o_strategy in itertools.product(strategies, repeat=2):
+        for index, first in enumerate(range(0, games, shard_size)):
+            yield (x_strategy, o_strategy, min(shard_size, games - first),
+                   f"{seed}:{x_strategy}:{o_strategy}:{index}", config.size, config.win_length,
+                   cache_dir)
+
+
+class TournamentResult:
+    """Per-pairing BatchStats plus the wall-clock time of the whole run"""
+
+    def __init__(self, pairings, wall_time, workers):
+        self.pairings = pairings
+        self.wall_time = wall_time
+        self.workers = workers
+
+    @property
+    def total_games(self):
+        return sum(stats.games for stats in self.pairings.values())
+
+    @property
+    def total_moves(self):
+        return sum(stats.total_moves for stats in self.pairings.values())
+
+    @property
+    def games_per_second(self):
+        return self.total_games / self.wall_time if self.wall_time else 0.0
+
+    def session_stats(self):
+        """Everything merged into the tally the statistics panel shows"""
+        stats = SessionStats()
+        for batch in self.pairings.values():
+            stats.merge(batch.session_stats())
+        return stats
+
+
+def run_tournament(strategies=DEFAULT_STRATEGIES, games=1000, workers=None, seed=0,
+                   shard_size=DEFAULT_SHARD_SIZE, config=CLASSIC, cache_dir=None):
+    """Play games per ordered pairing of strategies on a process pool.
+
+    workers=1 plays every shard in this process, which gives the serial
+    baseline for scaling measurements. With cache_dir every shard starts
+    from the persistent table cache there.
+    """
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {name}")
+    workers = workers or os.cpu_count() or 1
+    tasks = list(shard_tasks(strategies, games, seed, shard_size, config, cache_dir))
+    pairings = {}
+
+    start = time.perf_counter()
+    if workers == 1:
+        for pairing, stats in map(play_shard, tasks):
+            pairings.setdefault(pairing, BatchStats()).merge(stats)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for pairing, stats in pool.map(play_shard, tasks):
+                pairings.setdefault(pairing, BatchStats()).merge(stats)
+    return TournamentResult(pairings, time.perf_counter() - start, workers)
+
+
+def measure_scaling(worker_counts, **kwargs):
+    """Run the same tournament at each worker count; yield (workers, result, speedup)"""
+    baseline = None
+    for workers in worker_counts:
+        result = run_tournament(workers=workers, **kwargs)
+        if baseline is None:
+            baseline = result.wall_time
+        yield workers, result, baseline / result.wall_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel AI-vs-AI Tic-Tac-Toe tournament")
+    parser.add_argument('strategies', nargs='*', default=list(DEFAULT_STRATEGIES),
+                        help="strategies to pair up (default: easy medium hard)")
+    parser.add_argument('--games', type=int, default=1000, help="games per pairing (default 1000)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--seed', type=int, default=0, help="tournament seed (default 0)")
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f"games per task (default {DEFAULT_SHARD_SIZE})")
+    parser.add_argument('--size', type=int, default=3, help="board size (default 3)")
+    parser.add_argument('--win-length', type=int, default=None, help="pieces in a row to win")
+    parser.add_argument('--cache-dir', default=None,
+                        help="warm every worker from the persistent AI cache in this directory")
+    parser.add_argument('--scaling', action='store_true',
+                        help="repeat the run with 1, 2, 4, ... workers and report the speedup")
+    args = parser.parse_args(argv)
+
+    kwargs = {
+        'strategies': args.strategies,
+        'games': args.games,
+        'seed': args.seed,
+        'shard_size': args.shard_size,
+        'config': board_config(args.size, args.win_length or args.size),
+        'cache_dir': args.cache_dir,
+    }
+
+    if args.scaling:
+        max_workers = args.workers or os.cpu_count() or 1
+        counts = [1]
+        while counts[-1] * 2 <= max_workers:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != max_workers:
+            counts.append(max_workers)
+        for workers, result, speedup in measure_scaling(counts, **kwargs):
+            print(f"{workers:3d} workers: {result.wall_time:7.2f}s, "
+                  f"{result.games_per_second:10,.0f} games/s, speedup {speedup:.2f}x")
+        return 0
+
+    result = run_tournament(workers=args.workers, **kwargs)
+    for (x_strategy, o_strategy), stats in sorted(result.pairings.items()):
+        print(f"{x_strategy:>8} (X) vs {o_strategy:<8} (O): {stats}")
+    session = result.session_stats()
+    print(f"Total: {session.game_count} games, X wins {session.scores['player']}, "
+          f"O wins {session.scores['opponent']}, draws {session.scores['draw']} "
+          f"in {result.wall_time:.2f}s with {result.workers} workers "
+          f"({result.games_per_second:,.0f} games/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,644 @@
+import argparse
+import queue
+import threading
+import time
+import traceback
 import tkinter as tk
+from collections import deque
 from tkinter import messagebox
-import math
-import random
 from tkinter import font
 
+from tic_tac_toe_engine import (
+    BOARD_PRESETS, SearchCancelled, SessionStats, TicTacToeEngine, board_config
+)
+
+class AIWorker:
+    """Runs AI searches on a background thread and hands results back to Tk.
+    
+    Results travel through a thread-safe queue that the Tk main loop polls
+    with after(), so widgets are only ever touched from the main thread.
+    Every request gets a generation number; cancel() bumps it and stops the
+    running search, so a late result from an old game is dropped. A search
+    that raises is still answered, with no move and the exception in place
+    of the stats.
+    """
+    
+    POLL_MS = 15
+    
+    def __init__(self, window, on_result):
+        self.window = window
+        self.on_result = on_result
+        self.results = queue.Queue()
+        self.generation = 0
+        self.stop_event = None
+        self.poll_id = None
+    
+    @property
+    def busy(self):
+        return self.stop_event is not None
+    
+    def request(self, engine, difficulty):
+        """Start searching a fork of engine for the given difficulty"""
+        self.cancel()
+        self.generation += 1
+        self.stop_event = threading.Event()
+        
+        search_engine = engine.fork(difficulty)
+        search_engine.stop_event = self.stop_event
+        thread = threading.Thread(
+            target=self._run,
+            args=(self.generation, search_engine, difficulty),
+            name="ai-search",
+            daemon=True
+        )
+        thread.start()
+        self._schedule_poll()
+    
+    def cancel(self):
+        """Abandon the running search, if any"""
+        self.generation += 1
+        if self.stop_event is not None:
+            self.stop_event.set()
+            self.stop_event = None
+        if self.poll_id is not None:
+            self.window.after_cancel(self.poll_id)
+            self.poll_id = None
+    
+    def _run(self, generation, engine, difficulty):
+        """Worker thread body: search and post (generation, move, compute_ms, stats)"""
+        start = time.perf_counter()
+        try:
+            move = engine.get_ai_move(difficulty)
+        except SearchCancelled:
+            return
+        except Exception as exc:
+            # Answer anyway, or the game would wait for this move forever
+            traceback.print_exc()
+            self.results.put((generation, None, (time.perf_counter() - start) * 1000, exc))
+            return
+        compute_ms = (time.perf_counter() - start) * 1000
+        self.results.put((generation, move, compute_ms, engine.last_search_stats))
+    
+    def _schedule_poll(self):
+        if self.poll_id is None:
+            self.poll_id = self.window.after(self.POLL_MS, self._poll)
+    
+    def _poll(self):
+        """Drain finished searches on the Tk thread"""
+        self.poll_id = None
+        while True:
+            try:
+                generation, move, compute_ms, stats = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation:
+                self.stop_event = None
+                self.on_result(move, compute_ms, stats)
+        if self.busy:
+            self._schedule_poll()
+
+class Overlay:
+    """Modal dialog window that is built once, then only shown and hidden.
+    
+    Building a Toplevel full of widgets for every message leaks Tcl objects
+    and makes each showing slower as a session goes on; subclasses build
+    their widgets once in __init__ and only change texts in show().
+    """
+    
+    def __init__(self, game, width, height, bg):
+        self.game = game
+        self.width = width
+        self.height = height
+        # Time the last show() took, for spotting slow end-of-game renders
+        self.show_ms = 0.0
+        
+        self.window = tk.Toplevel(game.window)
+        self.window.withdraw()
+        self.window.configure(bg=bg)
+        self.window.resizable(False, False)
+        self.window.transient(game.window)
+        self.window.protocol('WM_DELETE_WINDOW', self.hide)
+        self.window.bind('<Escape>', lambda e: self.hide())
+    
+    def present(self, title):
+        """Center over the main window, show and grab input"""
+        parent = self.game.window
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - self.width // 2
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - self.height // 2
+        self.window.title(title)
+        self.window.geometry(f"{self.width}x{self.height}+{x}+{y}")
+        self.window.deiconify()
+        self.window.lift()
+        self.window.grab_set()
+    
+    def hide(self):
+        self.window.grab_release()
+        self.window.withdraw()
+
+class ResultOverlay(Overlay):
+    """End-of-game result with the session statistics"""
+    
+    STAT_ITEMS = (
+        ('games', "🎮", "Games Played"),
+        ('wins', "🏆", "Wins"),
+        ('losses', "💀", "Losses"),
+        ('draws', "🤝", "Draws")
+    )
+    
+    def __init__(self, game):
+        colors = game.colors
+        super().__init__(game, 600, 400, colors['bg_primary'])
+        self.window.attributes('-topmost', True)
+        
+        # Main container with padding
+        main_container = tk.Frame(self.window, bg=colors['bg_primary'])
+        main_container.pack(fill='both', expand=True, padx=20, pady=20)
+        
+        # Header section with enhanced styling
+        header_frame = tk.Frame(main_container, bg=colors['bg_secondary'], relief='flat', bd=0)
+        header_frame.pack(fill='x', pady=(0, 20))
+        
+        title_container = tk.Frame(header_frame, bg=colors['bg_secondary'])
+        title_container.pack(fill='x', pady=20)
+        
+        self.title_label = tk.Label(
+            title_container,
+            text="",
+            font=('Segoe UI', 28, 'bold'),
+            fg=colors['accent_primary'],
+            bg=colors['bg_secondary']
+        )
+        self.title_label.pack()
+        
+        # Decorative line
+        line_frame = tk.Frame(header_frame, bg=colors['accent_primary'], height=3)
+        line_frame.pack(fill='x', padx=50, pady=(10, 0))
+        
+        # Content section
+        content_frame = tk.Frame(main_container, bg=colors['bg_primary'])
+        content_frame.pack(fill='both', expand=True, pady=10)
+        
+        self.subtitle_label = tk.Label(
+            content_frame,
+            text="",
+            font=('Segoe UI', 14, 'normal'),
+            fg=colors['text_secondary'],
+            bg=colors['bg_primary'],
+            wraplength=500,
+            justify='center'
+        )
+        self.subtitle_label.pack(pady=(0, 20))
+        
+        # Stats section
+        stats_container = tk.Frame(content_frame, bg=colors['bg_secondary'], relief='flat')
+        stats_container.pack(fill='x', pady=(0, 30), padx=20)
+        
+        tk.Label(
+            stats_container,
+            text="📊 Session Statistics",
+            font=('Segoe UI', 16, 'bold'),
+            fg=colors['text_primary'],
+            bg=colors['bg_secondary']
+        ).pack(pady=(15, 10))
+        
+        stats_grid = tk.Frame(stats_container, bg=colors['bg_secondary'])
+        stats_grid.pack(pady=(0, 15))
+        
+        self.value_labels = {}
+        for i, (key, icon, label) in enumerate(self.STAT_ITEMS):
+            stat_frame = tk.Frame(stats_grid, bg=colors['bg_tertiary'], relief='flat')
+            stat_frame.grid(row=0, column=i, padx=10, pady=5, sticky='ew')
+            stats_grid.grid_columnconfigure(i, weight=1)
+            
+            tk.Label(
+                stat_frame,
+                text=icon,
+                font=('Segoe UI', 18),
+                fg=colors['accent_primary'],
+                bg=colors['bg_tertiary']
+            ).pack(pady=(10, 5))
+            
+            value_label = tk.Label(
+                stat_frame,
+                text="0",
+                font=('Segoe UI', 20, 'bold'),
+                fg=colors['text_primary'],
+                bg=colors['bg_tertiary']
+            )
+            value_label.pack()
+            self.value_labels[key] = value_label
+            
+            tk.Label(
+                stat_frame,
+                text=label,
+                font=('Segoe UI', 10),
+                fg=colors['text_secondary'],
+                bg=colors['bg_tertiary']
+            ).pack(pady=(0, 10))
+        
+        self.win_rate_label = tk.Label(
+            stats_container,
+            text="",
+            font=('Segoe UI', 14, 'bold'),
+            bg=colors['bg_secondary']
+        )
+        self.win_rate_label.pack(pady=(0, 15))
+        
+        # Buttons section
+        button_container = tk.Frame(main_container, bg=colors['bg_primary'])
+        button_container.pack(fill='x', pady=(20, 0))
+        
+        button_frame = tk.Frame(button_container, bg=colors['bg_primary'])
+        button_frame.pack()
+        
+        self.play_again_btn = self.create_button(
+            button_frame, "🔄 PLAY AGAIN", 14, colors['success'], '#00a085', self.play_again
+        )
+        self.continue_btn = self.create_button(
+            button_frame, "✓ CONTINUE", 14, colors['accent_primary'], colors['accent_secondary'],
+            self.hide
+        )
+        self.create_button(
+            button_frame, "❌ CLOSE", 12, colors['danger'], '#d63384', self.close,
+            padx=25, pady=12
+        )
+        
+        # Keyboard shortcuts
+        self.window.bind('<Return>', lambda e: self.continue_btn.invoke())
+        self.window.bind('<space>', lambda e: self.play_again_btn.invoke())
+    
+    def create_button(self, parent, text, size, color, hover_color, command, padx=30, pady=15):
+        button = tk.Button(
+            parent,
+            text=text,
+            font=('Segoe UI', size, 'bold'),
+            bg=color,
+            fg=self.game.colors['text_primary'],
+            padx=padx, pady=pady,
+            command=command,
+            cursor='hand2',
+            relief='flat',
+            bd=0,
+            activebackground=hover_color,
+            activeforeground=self.game.colors['text_primary']
+        )
+        button.pack(side='left', padx=15)
+        button.bind("<Enter>", lambda e: self.game.on_button_enter(button, hover_color))
+        button.bind("<Leave>", lambda e: self.game.on_button_leave(button, color))
+        return button
+    
+    def show(self, title, subtitle, stats):
+        start = time.perf_counter()
+        colors = self.game.colors
+        self.title_label.config(text=title)
+        self.subtitle_label.config(text=subtitle)
+        values = {
+            'games': stats.game_count,
+            'wins': stats.scores['player'],
+            'losses': stats.scores['opponent'],
+            'draws': stats.scores['draw']
+        }
+        for key, value in values.items():
+            self.value_labels[key].config(text=str(value))
+        
+        if stats.game_count > 0:
+            win_rate = stats.win_rate
+            self.win_rate_label.config(
+                text=f"📈 Win Rate: {win_rate:.1f}%",
+                fg=colors['success'] if win_rate > 50 else colors['warning'] if win_rate > 25 else colors['danger']
+            )
+        else:
+            self.win_rate_label.config(text="📈 Win Rate: N/A", fg=colors['danger'])
+        
+        self.present("Game Result")
+        self.continue_btn.focus_set()
+        self.show_ms = (time.perf_counter() - start) * 1000
+    
+    def play_again(self):
+        self.hide()
+        self.game.reset_game()
+    
+    def close(self):
+        self.hide()
+        self.game.window.quit()
+
+class NoticeOverlay(Overlay):
+    """Short confirmation message with a single dismiss button"""
+    
+    def __init__(self, game):
+        colors = game.colors
+        fonts = game.fonts
+        super().__init__(game, 400, 200, colors['bg_secondary'])
+        
+        self.heading_label = tk.Label(
+            self.window,
+            text="",
+            font=fonts['heading'],
+            fg=colors['text_primary'],
+            bg=colors['bg_secondary']
+        )
+        self.heading_label.pack(pady=40)
+        
+        self.message_label = tk.Label(
+            self.window,
+            text="",
+            font=fonts['body'],
+            fg=colors['text_secondary'],
+            bg=colors['bg_secondary']
+        )
+        self.message_label.pack(pady=(0, 20))
+        
+        tk.Button(
+            self.window,
+            text="✓ UNDERSTOOD",
+            font=fonts['button'],
+            bg=colors['success'],
+            fg=colors['text_primary'],
+            padx=25, pady=10,
+            command=self.hide,
+            cursor='hand2',
+            relief='flat',
+            bd=0
+        ).pack()
+        self.window.bind('<Return>', lambda e: self.hide())
+    
+    def show(self, title, heading, message):
+        start = time.perf_counter()
+        self.heading_label.config(text=heading)
+        self.message_label.config(text=message)
+        self.present(title)
+        self.show_ms = (time.perf_counter() - start) * 1000
+
+class BoardRenderer:
+    """The board drawn on one Canvas, with a rectangle and a text item per cell.
+    
+    Each cell caches what it shows as a (text, look) pair, where look is
+    'idle' (no game running), 'open' (playable), 'closed' (game over),
+    'piece' or 'win'. Updates are compared with the cache and only the
+    items of cells that changed are reconfigured, so a move redraws one
+    cell and a 15x15 board costs canvas items rather than 225 widgets.
+    """
+    
+    BOARD_PIXELS = 420
+    
+    def __init__(self, parent, colors, font, on_click, animator):
+        self.colors = colors
+        self.base_font = font
+        self.on_click = on_click
+        self.animator = animator
+        self.canvas = tk.Canvas(
+            parent,
+            width=self.BOARD_PIXELS,
+            height=self.BOARD_PIXELS,
+            bg=colors['bg_secondary'],
+            highlightthickness=0,
+            bd=0,
+            cursor='hand2'
+        )
+        self.canvas.pack()
+        self.canvas.bind('<Button-1>', self.on_press)
+        self.canvas.bind('<Motion>', self.on_motion)
+        self.canvas.bind('<Leave>', lambda e: self.hover_later(None))
+        
+        self.size = 0
+        self.pitch = 0
+        self.rects = []
+        self.texts = []
+        self.states = []
+        self.hover = None
+        
+        # Redraw metric: updates, cells actually redrawn and time spent
+        self.redraws = 0
+        self.cells_drawn = 0
+        self.last_redraw_ms = 0.0
+        self.total_redraw_ms = 0.0
+    
+    def build(self, size):
+        """Create the cell items for a size x size board"""
+        self.canvas.delete('all')
+        self.size = size
+        self.pitch = self.BOARD_PIXELS / size
+        gap = 6 if size <= 5 else 2
+        # Shrink the glyphs as the grid grows so the board keeps its footprint
+        family, base_size, weight = self.base_font
+        font = (family, max(8, base_size * 3 // size), weight)
+        
+        self.rects = []
+        self.texts = []
+        for cell in range(size * size):
+            row, col = divmod(cell, size)
+            x0 = col * self.pitch + gap / 2
+            y0 = row * self.pitch + gap / 2
+            x1 = x0 + self.pitch - gap
+            y1 = y0 + self.pitch - gap
+            self.rects.append(self.canvas.create_rectangle(x0, y0, x1, y1, width=0))
+            self.texts.append(self.canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text='', font=font))
+        self.states = [None] * (size * size)
+        self.hover = None
+        self.render([('', 'idle')] * (size * size))
+    
+    def style(self, cell):
+        """(fill, outline, outline width, text color) for how cell looks now"""
+        text, look = self.states[cell]
+        colors = self.colors
+        if look == 'open':
+            fill = colors['button_hover'] if cell == self.hover else colors['bg_tertiary']
+            return fill, '', 0, colors['text_primary']
+        if look == 'idle':
+            return colors['bg_tertiary'], '', 0, colors['text_primary']
+        if look == 'closed':
+            return colors['border'], '', 0, colors['text_primary']
+        if look == 'win':
+            # Black text for better contrast on gold
+            return colors['win_glow'], colors['win_glow'], 2, '#000000'
+        if text == 'X':
+            return '#2a1810', colors['x_gradient_start'], 1, colors['x_gradient_start']
+        return '#1a2e2a', colors['o_gradient_start'], 1, colors['o_gradient_start']
+    
+    def draw(self, cell):
+        fill, outline, width, text_color = self.style(cell)
+        self.canvas.itemconfig(self.rects[cell], fill=fill, outline=outline, width=width)
+        self.canvas.itemconfig(self.texts[cell], text=self.states[cell][0], fill=text_color)
+    
+    def render(self, states):
+        """Show a (text, look) pair per cell, redrawing only the cells that changed"""
+        start = time.perf_counter()
+        drawn = 0
+        for cell, state in enumerate(states):
+            if state != self.states[cell]:
+                self.states[cell] = state
+                self.draw(cell)
+                drawn += 1
+        self.record(start, drawn)
+    
+    def set_cell(self, cell, text, look):
+        start = time.perf_counter()
+        drawn = 0
+        if self.states[cell] != (text, look):
+            self.states[cell] = (text, look)
+            self.draw(cell)
+            drawn = 1
+        self.record(start, drawn)
+    
+    def set_hover(self, cell):
+        """Move the hover highlight; only playable cells show it"""
+        if cell is not None and cell >= len(self.states):
+            # Queued before the board was rebuilt smaller
+            cell = None
+        if cell == self.hover:
+            return
+        start = time.perf_counter()
+        drawn = 0
+        previous, self.hover = self.hover, cell
+        for changed in (previous, cell):
+            if changed is not None and self.states[changed][1] == 'open':
+                self.draw(changed)
+                drawn += 1
+        self.record(start, drawn)
+    
+    def record(self, start, drawn):
+        elapsed = (time.perf_counter() - start) * 1000
+        self.redraws += 1
+        self.cells_drawn += drawn
+        self.last_redraw_ms = elapsed
+        self.total_redraw_ms += elapsed
+    
+    def cell_at(self, x, y):
+        """Cell under canvas coordinates, or None outside the board"""
+        if not self.size or not (0 <= x < self.BOARD_PIXELS and 0 <= y < self.BOARD_PIXELS):
+            return None
+        return int(y // self.pitch) * self.size + int(x // self.pitch)
+    
+    def on_press(self, event):
+        cell = self.cell_at(event.x, event.y)
+        if cell is not None:
+            self.on_click(cell)
+    
+    def on_motion(self, event):
+        self.hover_later(self.cell_at(event.x, event.y))
+    
+    def hover_later(self, cell):
+        """Move the hover highlight on the next frame; only the last move counts"""
+        self.animator.schedule((self, 'hover'), lambda: self.set_hover(cell))
+
+class AnimationScheduler:
+    """Runs every visual update of the window in at most one tick per frame.
+    
+    Updates are queued under a key, usually the widget they touch, and a
+    newer update for a key replaces the pending one, so a burst of hover
+    events costs one redraw. A tick stops after FRAME_BUDGET_MS and leaves
+    the rest for the next frame, nothing is scheduled while the queue is
+    empty, and ticks are paused while the window is minimized.
+    """
+    
+    FRAME_MS = 16
+    FRAME_BUDGET_MS = 8
+    # Frames kept for the frame-time stats
+    FRAME_HISTORY = 240
+    
+    def __init__(self, window):
+        self.window = window
+        self.pending = {}
+        self.tick_id = None
+        self.last_tick = 0.0
+        self.paused = False
+        
+        self.frames = 0
+        self.updates = 0
+        self.dropped = 0
+        self.deferred = 0
+        self.frame_times = deque(maxlen=self.FRAME_HISTORY)
+        
+        window.bind('<Unmap>', self.on_unmap, add='+')
+        window.bind('<Map>', self.on_map, add='+')
+    
+    def schedule(self, key, update):
+        """Run update on the next frame, replacing any pending update for key"""
+        if key in self.pending:
+            self.dropped += 1
+            del self.pending[key]
+        self.pending[key] = update
+        self.wake()
+    
+    def wake(self):
+        """Schedule the next tick on the frame grid, unless one is due already"""
+        if self.tick_id is not None or self.paused:
+            return
+        wait_ms = self.FRAME_MS - (time.perf_counter() - self.last_tick) * 1000
+        if wait_ms <= 0:
+            self.tick_id = self.window.after_idle(self.tick)
+        else:
+            self.tick_id = self.window.after(int(wait_ms) + 1, self.tick)
+    
+    def tick(self):
+        self.tick_id = None
+        start = time.perf_counter()
+        self.last_tick = start
+        deadline = start + self.FRAME_BUDGET_MS / 1000
+        
+        while self.pending:
+            key = next(iter(self.pending))
+            self.pending.pop(key)()
+            self.updates += 1
+            if self.pending and time.perf_counter() > deadline:
+                self.deferred += len(self.pending)
+                break
+        
+        self.frames += 1
+        self.frame_times.append((time.perf_counter() - start) * 1000)
+        if self.pending:
+            self.wake()
+    
+    def on_unmap(self, event):
+        if event.widget is self.window:
+            self.paused = True
+            self.cancel_tick()
+    
+    def on_map(self, event):
+        if event.widget is self.window and self.paused:
+            self.paused = False
+            if self.pending:
+                self.wake()
+    
+    def cancel_tick(self):
+        if self.tick_id is not None:
+            self.window.after_cancel(self.tick_id)
+            self.tick_id = None
+    
+    def stop(self):
+        """Drop everything queued, e.g. when the window closes"""
+        self.cancel_tick()
+        self.pending.clear()
+    
+    def stats(self):
+        """Frame-time figures over the last FRAME_HISTORY frames"""
+        times = sorted(self.frame_times) or [0.0]
+        return {
+            'frames': self.frames,
+            'updates': self.updates,
+            'dropped': self.dropped,
+            'deferred': self.deferred,
+            'avg_ms': sum(times) / len(times),
+            'p95_ms': times[min(len(times) - 1, len(times) * 95 // 100)],
+            'max_ms': times[-1],
+        }
+
 class UltraModernTicTacToe:
-    def __init__(self):
+    # Default minimum time the "AI thinking" state stays on screen in paced
+    # mode; the real compute time is subtracted from it
+    AI_MIN_THINK_MS = {'easy': 500, 'medium': 1000, 'hard': 1500, 'mcts': 1500}
+    
+    # 'paced' waits out the minimum thinking time, 'instant' plays the AI
+    # move as soon as it is found (automated play)
+    AI_PACING_MODES = ('paced', 'instant')
+    
+    def __init__(self, ai_pacing='paced', use_cache=True, ai_min_think_ms=None):
+        if ai_pacing not in self.AI_PACING_MODES:
+            raise ValueError(f"Unknown AI pacing mode: {ai_pacing}")
+        if ai_min_think_ms is not None and ai_min_think_ms < 0:
+            raise ValueError(f"Negative AI thinking time: {ai_min_think_ms}")
+        start = time.perf_counter()
+        
         self.window = tk.Tk()
         self.window.title("🎮 AI Mode Tic-Tac-Toe")
         
@@ -53,22 +686,48 @@ class UltraModernTicTacToe:
             'grid_line': '#6c5ce7'            # Purple grid lines
         }
         
-        # Game state
-        self.board = [' ' for _ in range(9)]
-        self.current_player = 'X'
+        # Game state lives in the headless engine; it loads no table, book
+        # or cache until the first AI move
+        self.engine = TicTacToeEngine()
+        if use_cache:
+            # Search results persist across sessions; read on the first search
+            self.engine.enable_cache()
         self.game_mode = None
         self.game_active = False
         self.difficulty = 'hard'
-        self.scores = {'player': 0, 'opponent': 0, 'draw': 0}
-        self.game_count = 0
-        
-        # Animation variables
-        self.hover_animation = {}
-        self.pulse_animation = False
+        self.stats = SessionStats()
+        
+        # AI search runs off the Tk thread
+        self.ai_worker = AIWorker(self.window, self.on_ai_result)
+        self.ai_delay_id = None
+        self.ai_pacing = ai_pacing
+        # One minimum thinking time for every level, or None for AI_MIN_THINK_MS
+        self.ai_min_think_ms = ai_min_think_ms
+        self.ai_request_time = None
+        self.search_debug = False
+        
+        # Dialogs are built on first use and then reused
+        self.result_overlay = None
+        self.notice_overlay = None
+        
+        # Hover and other visual updates are batched into one tick per frame
+        self.animator = AnimationScheduler(self.window)
+        
+        # Panels only needed later are built on first use
+        self.difficulty_section = None
+        self.difficulty_buttons = {}
+        self.debug_section = None
+        self.debug_labels = {}
         
         self.setup_fonts()
         self.setup_ultra_modern_ui()
         
+        # F2 toggles the search debug overlay
+        self.window.bind('<F2>', lambda e: self.toggle_search_debug())
+        
+        # Construction time; measure_startup() also counts the first frame
+        self.startup_ms = (time.perf_counter() - start) * 1000
+        
     def setup_fonts(self):
         """Setup modern fonts"""
         try:
@@ -113,9 +772,6 @@ class UltraModernTicTacToe:
         
         # Bottom status bar
         self.create_status_bar(main_container)
-        
-        # Start pulse animation for accent elements
-        self.start_pulse_animation()
     
     def create_header_section(self, parent):
         """Create stunning header with gradient effect"""
@@ -216,19 +872,14 @@ class UltraModernTicTacToe:
             self.colors['info']
         )
         
-        # AI difficulty section
-        self.difficulty_section = self.create_section(panel, "AI Difficulty Level")
+        # Board size section
+        # The AI difficulty section goes above this once AI mode is picked
+        self.board_size_section = self.create_section(panel, "Board Size")
         
-        self.difficulty_buttons = {}
-        difficulties = [
-            ('easy', '😊 BEGINNER', self.colors['success'], self.colors['info']),
-            ('medium', '😐 INTERMEDIATE', self.colors['warning'], self.colors['accent_tertiary']),
-            ('hard', '😤 EXPERT', self.colors['danger'], self.colors['accent_primary'])
-        ]
-        
-        for diff, text, color1, color2 in difficulties:
-            btn = self.create_difficulty_button(self.difficulty_section, text, diff, color1, color2)
-            self.difficulty_buttons[diff] = btn
+        self.board_size_buttons = {}
+        for label, size, win_length in BOARD_PRESETS:
+            btn = self.create_board_size_button(self.board_size_section, label, size, win_length)
+            self.board_size_buttons[(size, win_length)] = btn
         
         # Game controls
         controls_section = self.create_section(panel, "Game Actions")
@@ -257,6 +908,42 @@ class UltraModernTicTacToe:
             self.colors['border']
         )
     
+    def build_difficulty_section(self):
+        """Build the AI difficulty buttons the first time AI mode is picked"""
+        self.difficulty_section = self.create_section(self.board_size_section.master,
+                                                      "AI Difficulty Level")
+        
+        difficulties = [
+            ('easy', '😊 BEGINNER', self.colors['success'], self.colors['info']),
+            ('medium', '😐 INTERMEDIATE', self.colors['warning'], self.colors['accent_tertiary']),
+            ('hard', '😤 EXPERT', self.colors['danger'], self.colors['accent_primary']),
+            ('mcts', '🎲 MONTE CARLO', self.colors['info'], self.colors['accent_secondary'])
+        ]
+        
+        for diff, text, color1, color2 in difficulties:
+            btn = self.create_difficulty_button(self.difficulty_section, text, diff, color1, color2)
+            self.difficulty_buttons[diff] = btn
+    
+    def build_debug_section(self):
+        """Build the search debug overlay the first time F2 is pressed"""
+        self.debug_section = self.create_section(self.tips_section.master, "Search Debug (F2)")
+        
+        debug_frame = tk.Frame(self.debug_section, bg=self.colors['bg_tertiary'])
+        debug_frame.pack(fill='x', pady=5)
+        
+        for key in ('source', 'nodes', 'cutoffs', 'tt', 'depth', 'time', 'redraw', 'frames',
+                    'startup'):
+            label = tk.Label(
+                debug_frame,
+                text="",
+                font=self.fonts['small'],
+                fg=self.colors['info'],
+                bg=self.colors['bg_tertiary'],
+                anchor='w'
+            )
+            label.pack(fill='x', padx=10, pady=1)
+            self.debug_labels[key] = label
+    
     def create_section(self, parent, title):
         """Create a styled section"""
         section_frame = tk.Frame(parent, bg=self.colors['bg_secondary'])
@@ -328,6 +1015,32 @@ class UltraModernTicTacToe:
         
         return button
     
+    def create_board_size_button(self, parent, text, size, win_length):
+        """Create board size selection button"""
+        config = self.engine.config
+        is_selected = (config.size, config.win_length) == (size, win_length)
+        current_color = self.colors['info'] if is_selected else self.colors['bg_tertiary']
+        
+        button_frame = tk.Frame(parent, bg=current_color, relief='flat')
+        button_frame.pack(fill='x', pady=2)
+        
+        button = tk.Button(
+            button_frame,
+            text=f"{text} • {win_length} in a row",
+            font=self.fonts['small'],
+            bg=current_color,
+            fg=self.colors['text_primary'],
+            relief='flat',
+            bd=0,
+            padx=15,
+            pady=6,
+            command=lambda: self.set_board_size(size, win_length),
+            cursor='hand2'
+        )
+        button.pack(fill='both', expand=True, padx=1, pady=1)
+        
+        return button
+    
     def setup_center_panel(self, panel):
         """Setup center game board with enhanced modern styling"""
         # Game status section
@@ -379,41 +1092,11 @@ class UltraModernTicTacToe:
         )
         self.board_frame.pack(padx=6, pady=6)
         
-        # Create enhanced game grid with better visibility
-        self.buttons = []
-        for i in range(9):
-            row = i // 3
-            col = i % 3
-            
-            # Create button with fixed size and enhanced styling
-            button = tk.Button(
-                self.board_frame,
-                text='',
-                font=self.fonts['board'],
-                width=4, height=2,
-                bg=self.colors['bg_tertiary'],
-                fg=self.colors['text_primary'],
-                command=lambda pos=i: self.make_move(pos),
-                cursor='hand2',
-                state='disabled',
-                relief='flat',
-                bd=0,
-                activebackground=self.colors['button_hover']
-            )
-            button.grid(row=row, column=col, padx=3, pady=3, sticky='nsew')
-            self.buttons.append(button)
-            
-            # Configure grid weights for proper sizing
-            self.board_frame.grid_rowconfigure(row, weight=1)
-            self.board_frame.grid_columnconfigure(col, weight=1)
-            
-            # Enhanced hover effects
-            button.bind("<Enter>", lambda e, btn=button, pos=i: self.on_board_hover_enter(btn, pos))
-            button.bind("<Leave>", lambda e, btn=button, pos=i: self.on_board_hover_leave(btn, pos))
-        
-        # Add board size constraints
-        self.board_frame.configure(width=300, height=300)
-        self.board_frame.pack_propagate(False)
+        # The cells are drawn on a single canvas
+        self.board_view = BoardRenderer(
+            self.board_frame, self.colors, self.fonts['board'], self.make_move, self.animator
+        )
+        self.board_view.build(self.engine.config.size)
     
     def setup_right_panel(self, panel):
         """Setup right statistics panel"""
@@ -455,6 +1138,15 @@ class UltraModernTicTacToe:
         )
         self.current_difficulty_label.pack(anchor='w', padx=10, pady=2)
         
+        self.current_board_label = tk.Label(
+            self.current_info_frame,
+            text="Board: 3x3 • 3 in a row",
+            font=self.fonts['stats'],
+            fg=self.colors['text_secondary'],
+            bg=self.colors['bg_tertiary']
+        )
+        self.current_board_label.pack(anchor='w', padx=10, pady=2)
+        
         self.games_played_label = tk.Label(
             self.current_info_frame,
             text="Games Played: 0",
@@ -510,6 +1202,7 @@ class UltraModernTicTacToe:
         
         # Strategy tips
         tips_section = self.create_section(panel, "Pro Strategies")
+        self.tips_section = tips_section
         
         tips_frame = tk.Frame(tips_section, bg=self.colors['bg_tertiary'])
         tips_frame.pack(fill='x', pady=5)
@@ -561,39 +1254,25 @@ class UltraModernTicTacToe:
     
     def on_button_enter(self, button, hover_color):
         """Button hover enter effect"""
-        button.config(bg=hover_color)
+        self.animator.schedule(button, lambda: button.config(bg=hover_color))
         
     def on_button_leave(self, button, original_color):
         """Button hover leave effect"""
-        button.config(bg=original_color)
-    
-    def on_board_hover_enter(self, button, position):
-        """Board button hover enter"""
-        if button['state'] == 'normal' and button['text'] == '':
-            button.config(bg=self.colors['button_hover'])
-    
-    def on_board_hover_leave(self, button, position):
-        """Board button hover leave"""
-        if button['state'] == 'normal' and button['text'] == '':
-            button.config(bg=self.colors['bg_tertiary'])
-    
-    def start_pulse_animation(self):
-        """Start subtle pulse animation for accent elements"""
-        def pulse():
-            # This could be expanded for more complex animations
-            self.window.after(2000, pulse)
-        pulse()
+        self.animator.schedule(button, lambda: button.config(bg=original_color))
     
     def select_mode(self, mode):
         """Select game mode with visual feedback"""
         self.game_mode = mode
         
         if mode == 'ai':
-            self.difficulty_section.pack(fill='x', padx=15, pady=10)
+            if self.difficulty_section is None:
+                self.build_difficulty_section()
+            self.difficulty_section.pack(fill='x', padx=15, pady=10, before=self.board_size_section)
             self.current_mode_label.config(text="Mode: AI Challenge")
             self.turn_indicator.config(text="You play as X")
         else:
-            self.difficulty_section.pack_forget()
+            if self.difficulty_section is not None:
+                self.difficulty_section.pack_forget()
             self.current_mode_label.config(text="Mode: Friend Battle")
             self.turn_indicator.config(text="Player 1 is X, Player 2 is O")
         
@@ -609,7 +1288,8 @@ class UltraModernTicTacToe:
                 colors = {
                     'easy': self.colors['success'],
                     'medium': self.colors['warning'], 
-                    'hard': self.colors['danger']
+                    'hard': self.colors['danger'],
+                    'mcts': self.colors['info']
                 }
                 button.config(bg=colors[diff])
                 button.master.config(bg=colors[diff])
@@ -618,26 +1298,41 @@ class UltraModernTicTacToe:
                 button.master.config(bg=self.colors['bg_tertiary'])
         
         # Update difficulty display
-        diff_names = {'easy': 'Beginner', 'medium': 'Intermediate', 'hard': 'Expert'}
+        diff_names = {'easy': 'Beginner', 'medium': 'Intermediate', 'hard': 'Expert',
+                      'mcts': 'Monte Carlo'}
         self.current_difficulty_label.config(text=f"Difficulty: {diff_names[difficulty]}")
     
+    def set_board_size(self, size, win_length):
+        """Switch to another board size and rebuild the grid"""
+        self.engine.set_config(board_config(size, win_length))
+        
+        for key, button in self.board_size_buttons.items():
+            color = self.colors['info'] if key == (size, win_length) else self.colors['bg_tertiary']
+            button.config(bg=color)
+            button.master.config(bg=color)
+        
+        self.current_board_label.config(text=f"Board: {size}x{size} • {win_length} in a row")
+        self.board_view.build(size)
+        
+        if self.game_mode:
+            self.start_game()
+        else:
+            self.reset_game()
+    
+    def cancel_ai(self):
+        """Drop any pending or running AI move"""
+        if self.ai_delay_id is not None:
+            self.window.after_cancel(self.ai_delay_id)
+            self.ai_delay_id = None
+        self.ai_worker.cancel()
+    
     def start_game(self):
         """Start new game with enhanced visuals"""
+        self.cancel_ai()
         self.game_active = True
-        self.board = [' ' for _ in range(9)]
-        self.current_player = 'X'
-        
-        # Enable and reset buttons with improved styling
-        for button in self.buttons:
-            button.config(
-                state='normal',
-                text='',
-                bg=self.colors['bg_tertiary'],
-                fg=self.colors['text_primary'],
-                relief='flat',
-                bd=0,
-                highlightthickness=0
-            )
+        self.engine.reset()
+        
+        self.render_board('open')
         
         if self.game_mode == 'ai':
             self.status_label.config(text="Your move! Click any cell to start")
@@ -646,549 +1341,293 @@ class UltraModernTicTacToe:
     
     def make_move(self, position):
         """Make a move with enhanced visual feedback"""
-        if not self.game_active or self.board[position] != ' ':
+        if not self.game_active or self.engine.board[position] != ' ':
+            return
+        
+        # Ignore clicks while the AI is thinking
+        if self.game_mode == 'ai' and self.engine.current_player == 'O':
             return
         
         # Player move
-        self.board[position] = self.current_player
-        self.update_button(position, self.current_player)
+        player = self.engine.current_player
+        self.engine.play(position)
+        self.update_button(position, player)
         
         # Check winner
-        winner = self.check_winner()
-        if winner:
-            self.end_game(winner)
-            return
-        
-        if self.is_board_full():
-            self.end_game('draw')
+        result = self.check_winner()
+        if result is not None:
+            self.end_game(result)
             return
         
-        if self.game_mode == 'ai' and self.current_player == 'X':
-            self.current_player = 'O'
+        if self.game_mode == 'ai' and player == 'X':
             self.status_label.config(text="AI is calculating optimal move...")
             self.turn_indicator.config(text="AI thinking...")
-            
-            # AI delay with visual feedback
-            delay = {'easy': 500, 'medium': 1000, 'hard': 1500}[self.difficulty]
-            self.window.after(delay, self.ai_move)
-        else:
-            # Switch player
-            self.current_player = 'O' if self.current_player == 'X' else 'X'
-            if self.game_mode == 'human':
-                player_name = "Player 1" if self.current_player == 'X' else "Player 2"
-                self.status_label.config(text=f"{player_name}'s turn")
-                self.turn_indicator.config(text=f"Current: {self.current_player}")
+            self.ai_move()
+        elif self.game_mode == 'human':
+            player_name = "Player 1" if self.engine.current_player == 'X' else "Player 2"
+            self.status_label.config(text=f"{player_name}'s turn")
+            self.turn_indicator.config(text=f"Current: {self.engine.current_player}")
     
     def ai_move(self):
-        """AI makes move with visual enhancements"""
+        """Hand the AI's turn to the background search"""
         if not self.game_active:
             return
         
         # Get AI move based on difficulty
-        if self.difficulty == 'easy':
-            best_move = self.get_random_move()
-        elif self.difficulty == 'medium':
-            best_move = self.get_best_move() if random.random() < 0.7 else self.get_random_move()
+        self.ai_request_time = time.perf_counter()
+        self.ai_worker.request(self.engine, self.difficulty)
+    
+    def ai_pacing_delay(self):
+        """Milliseconds still to wait before showing the AI move"""
+        if self.ai_pacing == 'instant':
+            return 0
+        min_think_ms = self.ai_min_think_ms
+        if min_think_ms is None:
+            min_think_ms = self.AI_MIN_THINK_MS[self.difficulty]
+        elapsed_ms = (time.perf_counter() - self.ai_request_time) * 1000
+        return max(0, int(min_think_ms - elapsed_ms))
+    
+    def on_ai_result(self, best_move, compute_ms, search_stats):
+        """Search finished: play the move now or once the thinking time is up"""
+        if isinstance(search_stats, Exception):
+            # The search failed; keep the game going with a random move
+            best_move = self.engine.get_random_move()
+            search_stats = None
+        elif search_stats is not None:
+            # The search ran on a fork; keep its figures with this engine's
+            self.engine.record_search_stats(search_stats)
+        
+        if self.search_debug:
+            self.update_search_debug(compute_ms, search_stats)
+        
+        delay = self.ai_pacing_delay()
+        if delay:
+            self.ai_delay_id = self.window.after(delay, self.apply_ai_move, best_move, compute_ms)
         else:
-            best_move = self.get_best_move()
+            self.apply_ai_move(best_move, compute_ms)
+    
+    def toggle_search_debug(self):
+        """Show or hide the search debug overlay and its instrumentation"""
+        self.search_debug = not self.search_debug
+        if self.search_debug:
+            self.engine.enable_instrumentation()
+            if self.debug_section is None:
+                self.build_debug_section()
+            self.debug_section.pack(fill='x', padx=15, pady=10, before=self.tips_section)
+            self.update_search_debug(None, None)
+        else:
+            self.engine.disable_instrumentation()
+            self.debug_section.pack_forget()
+    
+    def update_search_debug(self, compute_ms, stats):
+        """Show the cost of the last AI move in the debug overlay"""
+        labels = self.debug_labels
+        if compute_ms is None:
+            texts = {'source': "Waiting for the next AI move..."}
+        elif stats is None:
+            texts = {
+                'source': "Source: table lookup / random",
+                'time': f"Wall time: {compute_ms:.2f} ms",
+            }
+        else:
+            texts = {
+                'source': f"Source: {stats.kind}",
+                'nodes': f"Nodes: {stats.nodes:,} ({stats.nodes_per_second:,.0f}/s)",
+                'cutoffs': f"Beta cutoffs: {stats.cutoffs:,}",
+                'tt': f"TT hits: {stats.tt_hits:,} / {stats.tt_probes:,}",
+                'depth': f"Depth: {stats.depth} (max ply {stats.max_ply})",
+                'time': f"Wall time: {stats.wall_ms:.2f} ms",
+            }
+        view = self.board_view
+        if view.redraws:
+            texts['redraw'] = (f"Board redraw: {view.last_redraw_ms:.2f} ms last, "
+                               f"{view.total_redraw_ms / view.redraws:.2f} ms avg")
+        frames = self.animator.stats()
+        if frames['frames']:
+            texts['frames'] = (f"Frames: {frames['avg_ms']:.2f} ms avg, {frames['max_ms']:.2f} ms max, "
+                               f"{frames['dropped']} updates merged")
+        texts['startup'] = f"Startup: {self.startup_ms:.1f} ms"
+        for key, label in labels.items():
+            label.config(text=texts.get(key, ""))
+    
+    def apply_ai_move(self, best_move, compute_ms):
+        """AI makes move with visual enhancements"""
+        self.ai_delay_id = None
+        if not self.game_active:
+            return
         
         if best_move is not None:
-            self.board[best_move] = 'O'
+            self.engine.play(best_move, 'O')
             self.update_button(best_move, 'O')
             
-            winner = self.check_winner()
-            if winner:
-                self.end_game(winner)
-                return
-            
-            if self.is_board_full():
-                self.end_game('draw')
+            result = self.check_winner()
+            if result is not None:
+                self.end_game(result)
                 return
             
-            self.current_player = 'X'
             self.status_label.config(text="Your turn - Choose your next move")
-            self.turn_indicator.config(text="Your move")
-    
-    def get_random_move(self):
-        """Get random move for easy AI"""
-        available = self.get_available_moves()
-        return random.choice(available) if available else None
+            self.turn_indicator.config(text=f"Your move • AI computed in {compute_ms:.0f} ms")
     
     def update_button(self, position, player):
-        """Update button with enhanced modern styling"""
-        if player == 'X':
-            color = self.colors['x_gradient_start']
-            bg_color = '#2a1810'  # Dark red background
-        else:
-            color = self.colors['o_gradient_start']
-            bg_color = '#1a2e2a'  # Dark teal background
-        
-        self.buttons[position].config(
-            text=player,
-            fg=color,
-            state='disabled',
-            bg=bg_color,
-            font=self.fonts['board'],
-            relief='flat',
-            bd=2,
-            highlightbackground=color,
-            highlightcolor=color,
-            highlightthickness=1
-        )
+        """Draw the piece just played"""
+        self.board_view.set_cell(position, player, 'piece')
+    
+    def render_board(self, empty_look, win_line=None):
+        """Redraw the board from the engine.
+        
+        Empty cells are shown as empty_look and the cells of win_line, if
+        given, are highlighted.
+        """
+        board = self.engine.board
+        states = [('', empty_look) if piece == ' ' else (piece, 'piece') for piece in board]
+        if win_line is not None:
+            for pos in win_line:
+                states[pos] = (board[pos], 'win')
+        self.board_view.render(states)
     
     def check_winner(self):
-        """Check for winner with enhanced highlighting"""
-        winning_combinations = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],  # rows
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],  # columns
-            [0, 4, 8], [2, 4, 6]              # diagonals
-        ]
-        
-        for combo in winning_combinations:
-            if (self.board[combo[0]] == self.board[combo[1]] == 
-                self.board[combo[2]] != ' '):
-                # Enhanced highlighting for winning combination
-                for pos in combo:
-                    self.buttons[pos].config(
-                        bg=self.colors['win_glow'],
-                        fg='#000000',  # Black text for better contrast on gold
-                        relief='raised',
-                        bd=3,
-                        highlightbackground=self.colors['win_glow'],
-                        highlightthickness=2
-                    )
-                return self.board[combo[0]]
-        return None
-    
-    def is_board_full(self):
-        return ' ' not in self.board
-    
-    def get_available_moves(self):
-        return [i for i in range(9) if self.board[i] == ' ']
-    
-    def minimax(self, depth, maximizing_player, alpha=-math.inf, beta=math.inf):
-        """Minimax algorithm for AI"""
-        winner = self.check_winner_simple()
-        
-        if winner == 'O':
-            return 1
-        elif winner == 'X':
-            return -1
-        elif self.is_board_full():
-            return 0
-        
-        if maximizing_player:
-            max_eval = -math.inf
-            for move in self.get_available_moves():
-                self.board[move] = 'O'
-                eval_score = self.minimax(depth + 1, False, alpha, beta)
-                self.board[move] = ' '
-                max_eval = max(max_eval, eval_score)
-                alpha = max(alpha, eval_score)
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:
-            min_eval = math.inf
-            for move in self.get_available_moves():
-                self.board[move] = 'X'
-                eval_score = self.minimax(depth + 1, True, alpha, beta)
-                self.board[move] = ' '
-                min_eval = min(min_eval, eval_score)
-                beta = min(beta, eval_score)
-                if beta <= alpha:
-                    break
-            return min_eval
-    
-    def check_winner_simple(self):
-        """Simple winner check for AI"""
-        winning_combinations = [
-            [0, 1, 2], [3, 4, 5], [6, 7, 8],
-            [0, 3, 6], [1, 4, 7], [2, 5, 8],
-            [0, 4, 8], [2, 4, 6]
-        ]
-        
-        for combo in winning_combinations:
-            if (self.board[combo[0]] == self.board[combo[1]] == 
-                self.board[combo[2]] != ' '):
-                return self.board[combo[0]]
-        return None
-    
-    def get_best_move(self):
-        """Get best move using minimax"""
-        best_score = -math.inf
-        best_move = None
-        
-        for move in self.get_available_moves():
-            self.board[move] = 'O'
-            score = self.minimax(0, False)
-            self.board[move] = ' '
-            
-            if score > best_score:
-                best_score = score
-                best_move = move
-        
-        return best_move
+        """WinResult if the game is over, else None; never touches the widgets"""
+        return self.engine.game_result()
     
     def end_game(self, result):
-        """End game with spectacular visual effects"""
+        """End game with spectacular visual effects; result is a WinResult"""
         self.game_active = False
-        self.game_count += 1
-        
-        # Disable all buttons with proper styling
-        for button in self.buttons:
-            if button['text'] == '':
-                button.config(
-                    state='disabled', 
-                    bg=self.colors['border'],
-                    relief='flat',
-                    bd=0
-                )
+        self.stats.record(result.winner)
+        self.engine.save_cache()
+        
+        # Highlight the winning line and grey out the cells that are left
+        self.render_board('closed', result.line)
         
         # Update scores and show result
-        if result == 'draw':
+        if result.is_draw:
             message = "🤝 Epic Draw!"
             subtitle = "Both players showed great skill!"
             self.status_label.config(text="Draw - Excellent match!")
-            self.scores['draw'] += 1
-        elif result == 'X':
+        elif result.winner == 'X':
             if self.game_mode == 'ai':
                 message = "🎉 Victory!"
                 subtitle = "You defeated the AI! Incredible!"
                 self.status_label.config(text="You won! Outstanding performance!")
-                self.scores['player'] += 1
             else:
                 message = "🏆 Player 1 Wins!"
                 subtitle = "Masterful strategy and execution!"
                 self.status_label.config(text="Player 1 claims victory!")
-                self.scores['player'] += 1
         else:  # O wins
             if self.game_mode == 'ai':
                 message = "🤖 AI Victory"
                 subtitle = "The machine proves its superiority!"
                 self.status_label.config(text="AI wins this round!")
-                self.scores['opponent'] += 1
             else:
                 message = "🏆 Player 2 Wins!"
                 subtitle = "Strategic brilliance on display!"
                 self.status_label.config(text="Player 2 takes the crown!")
-                self.scores['opponent'] += 1
         
         self.update_statistics_display()
         self.show_ultra_modern_result_dialog(message, subtitle)
     
     def show_ultra_modern_result_dialog(self, title, subtitle):
-        """Show ultra-modern result dialog with enhanced styling"""
-        result_window = tk.Toplevel(self.window)
-        result_window.title("Game Result")
-        result_window.geometry("600x400")
-        result_window.configure(bg=self.colors['bg_primary'])
-        result_window.resizable(False, False)
-        
-        # Make it modal and always on top
-        result_window.transient(self.window)
-        result_window.grab_set()
-        result_window.attributes('-topmost', True)
-        
-        # Center on parent window
-        x = self.window.winfo_x() + (self.window.winfo_width() // 2) - 300
-        y = self.window.winfo_y() + (self.window.winfo_height() // 2) - 200
-        result_window.geometry(f"600x400+{x}+{y}")
-        
-        # Main container with padding
-        main_container = tk.Frame(result_window, bg=self.colors['bg_primary'])
-        main_container.pack(fill='both', expand=True, padx=20, pady=20)
-        
-        # Header section with enhanced styling
-        header_frame = tk.Frame(main_container, bg=self.colors['bg_secondary'], relief='flat', bd=0)
-        header_frame.pack(fill='x', pady=(0, 20))
-        
-        # Title with icon and styling
-        title_container = tk.Frame(header_frame, bg=self.colors['bg_secondary'])
-        title_container.pack(fill='x', pady=20)
-        
-        title_label = tk.Label(
-            title_container,
-            text=title,
-            font=('Segoe UI', 28, 'bold'),
-            fg=self.colors['accent_primary'],
-            bg=self.colors['bg_secondary']
-        )
-        title_label.pack()
-        
-        # Decorative line
-        line_frame = tk.Frame(header_frame, bg=self.colors['accent_primary'], height=3)
-        line_frame.pack(fill='x', padx=50, pady=(10, 0))
-        
-        # Content section
-        content_frame = tk.Frame(main_container, bg=self.colors['bg_primary'])
-        content_frame.pack(fill='both', expand=True, pady=10)
-        
-        # Subtitle with better spacing
-        subtitle_label = tk.Label(
-            content_frame,
-            text=subtitle,
-            font=('Segoe UI', 14, 'normal'),
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_primary'],
-            wraplength=500,
-            justify='center'
-        )
-        subtitle_label.pack(pady=(0, 20))
-        
-        # Stats section with enhanced layout
-        stats_container = tk.Frame(content_frame, bg=self.colors['bg_secondary'], relief='flat')
-        stats_container.pack(fill='x', pady=(0, 30), padx=20)
-        
-        stats_title = tk.Label(
-            stats_container,
-            text="📊 Session Statistics",
-            font=('Segoe UI', 16, 'bold'),
-            fg=self.colors['text_primary'],
-            bg=self.colors['bg_secondary']
-        )
-        stats_title.pack(pady=(15, 10))
-        
-        # Stats grid
-        stats_grid = tk.Frame(stats_container, bg=self.colors['bg_secondary'])
-        stats_grid.pack(pady=(0, 15))
-        
-        # Individual stat items
-        stat_items = [
-            ("🎮", "Games Played", str(self.game_count)),
-            ("🏆", "Wins", str(self.scores['player'])),
-            ("💀", "Losses", str(self.scores['opponent'])),
-            ("🤝", "Draws", str(self.scores['draw']))
-        ]
-        
-        for i, (icon, label, value) in enumerate(stat_items):
-            stat_frame = tk.Frame(stats_grid, bg=self.colors['bg_tertiary'], relief='flat')
-            stat_frame.grid(row=0, column=i, padx=10, pady=5, sticky='ew')
-            
-            # Configure column weights
-            stats_grid.grid_columnconfigure(i, weight=1)
-            
-            icon_label = tk.Label(
-                stat_frame,
-                text=icon,
-                font=('Segoe UI', 18),
-                fg=self.colors['accent_primary'],
-                bg=self.colors['bg_tertiary']
-            )
-            icon_label.pack(pady=(10, 5))
-            
-            value_label = tk.Label(
-                stat_frame,
-                text=value,
-                font=('Segoe UI', 20, 'bold'),
-                fg=self.colors['text_primary'],
-                bg=self.colors['bg_tertiary']
-            )
-            value_label.pack()
-            
-            label_label = tk.Label(
-                stat_frame,
-                text=label,
-                font=('Segoe UI', 10),
-                fg=self.colors['text_secondary'],
-                bg=self.colors['bg_tertiary']
-            )
-            label_label.pack(pady=(0, 10))
-        
-        # Win rate display
-        if self.game_count > 0:
-            win_rate = (self.scores['player'] / self.game_count) * 100
-            win_rate_text = f"📈 Win Rate: {win_rate:.1f}%"
-        else:
-            win_rate_text = "📈 Win Rate: N/A"
-        
-        win_rate_label = tk.Label(
-            stats_container,
-            text=win_rate_text,
-            font=('Segoe UI', 14, 'bold'),
-            fg=self.colors['success'] if win_rate > 50 else self.colors['warning'] if win_rate > 25 else self.colors['danger'],
-            bg=self.colors['bg_secondary']
-        )
-        win_rate_label.pack(pady=(0, 15))
-        
-        # Buttons section
-        button_container = tk.Frame(main_container, bg=self.colors['bg_primary'])
-        button_container.pack(fill='x', pady=(20, 0))
-        
-        # Center the buttons
-        button_frame = tk.Frame(button_container, bg=self.colors['bg_primary'])
-        button_frame.pack()
-        
-        # Play again button with enhanced styling
-        play_again_btn = tk.Button(
-            button_frame,
-            text="🔄 PLAY AGAIN",
-            font=('Segoe UI', 14, 'bold'),
-            bg=self.colors['success'],
-            fg=self.colors['text_primary'],
-            padx=30, pady=15,
-            command=lambda: [result_window.destroy(), self.reset_game()],
-            cursor='hand2',
-            relief='flat',
-            bd=0,
-            activebackground='#00a085',
-            activeforeground=self.colors['text_primary']
-        )
-        play_again_btn.pack(side='left', padx=15)
-        
-        # Continue button
-        continue_btn = tk.Button(
-            button_frame,
-            text="✓ CONTINUE",
-            font=('Segoe UI', 14, 'bold'),
-            bg=self.colors['accent_primary'],
-            fg=self.colors['text_primary'],
-            padx=30, pady=15,
-            command=result_window.destroy,
-            cursor='hand2',
-            relief='flat',
-            bd=0,
-            activebackground=self.colors['accent_secondary'],
-            activeforeground=self.colors['text_primary']
-        )
-        continue_btn.pack(side='left', padx=15)
-        
-        # Close button
-        close_btn = tk.Button(
-            button_frame,
-            text="❌ CLOSE",
-            font=('Segoe UI', 12, 'bold'),
-            bg=self.colors['danger'],
-            fg=self.colors['text_primary'],
-            padx=25, pady=12,
-            command=lambda: [result_window.destroy(), self.window.quit()],
-            cursor='hand2',
-            relief='flat',
-            bd=0,
-            activebackground='#d63384',
-            activeforeground=self.colors['text_primary']
-        )
-        close_btn.pack(side='left', padx=15)
-        
-        # Add hover effects for buttons
-        def on_button_hover(button, enter_color, leave_color):
-            def on_enter(e):
-                button.config(bg=enter_color)
-            def on_leave(e):
-                button.config(bg=leave_color)
-            return on_enter, on_leave
-        
-        play_enter, play_leave = on_button_hover(play_again_btn, '#00a085', self.colors['success'])
-        play_again_btn.bind("<Enter>", play_enter)
-        play_again_btn.bind("<Leave>", play_leave)
-        
-        cont_enter, cont_leave = on_button_hover(continue_btn, self.colors['accent_secondary'], self.colors['accent_primary'])
-        continue_btn.bind("<Enter>", cont_enter)
-        continue_btn.bind("<Leave>", cont_leave)
-        
-        close_enter, close_leave = on_button_hover(close_btn, '#d63384', self.colors['danger'])
-        close_btn.bind("<Enter>", close_enter)
-        close_btn.bind("<Leave>", close_leave)
-        
-        # Focus on continue button by default
-        continue_btn.focus_set()
-        
-        # Keyboard shortcuts
-        result_window.bind('<Return>', lambda e: continue_btn.invoke())
-        result_window.bind('<Escape>', lambda e: result_window.destroy())
-        result_window.bind('<space>', lambda e: play_again_btn.invoke())
+        """Show the result overlay, building it on first use"""
+        if self.result_overlay is None:
+            self.result_overlay = ResultOverlay(self)
+        self.result_overlay.show(title, subtitle, self.stats)
     
     def update_statistics_display(self):
         """Update all statistics displays"""
         # Update individual stat labels
-        self.wins_label.config(text=f"🏆 Wins: {self.scores['player']}")
-        self.losses_label.config(text=f"💀 Losses: {self.scores['opponent']}")
-        self.draws_label.config(text=f"🤝 Draws: {self.scores['draw']}")
-        self.games_played_label.config(text=f"Games Played: {self.game_count}")
+        self.wins_label.config(text=f"🏆 Wins: {self.stats.scores['player']}")
+        self.losses_label.config(text=f"💀 Losses: {self.stats.scores['opponent']}")
+        self.draws_label.config(text=f"🤝 Draws: {self.stats.scores['draw']}")
+        self.games_played_label.config(text=f"Games Played: {self.stats.game_count}")
         
         # Calculate and update win rate
-        if self.game_count > 0:
-            win_rate = (self.scores['player'] / self.game_count) * 100
+        if self.stats.game_count > 0:
+            win_rate = self.stats.win_rate
             self.winrate_label.config(text=f"📈 Win Rate: {win_rate:.1f}%")
         else:
             self.winrate_label.config(text="📈 Win Rate: 0%")
     
     def reset_game(self):
         """Reset game with enhanced visual feedback"""
+        self.cancel_ai()
         self.game_active = False
-        self.board = [' ' for _ in range(9)]
-        self.current_player = 'X'
-        
-        # Reset buttons with improved styling
-        for button in self.buttons:
-            button.config(
-                text='',
-                state='disabled',
-                bg=self.colors['bg_tertiary'],
-                fg=self.colors['text_primary'],
-                relief='flat',
-                bd=0,
-                highlightthickness=0
-            )
+        self.engine.reset()
+        
+        self.render_board('idle')
         
         self.status_label.config(text="Select a game mode to begin your journey")
         self.turn_indicator.config(text="")
     
     def reset_scores(self):
         """Reset all scores with confirmation"""
-        self.scores = {'player': 0, 'opponent': 0, 'draw': 0}
-        self.game_count = 0
+        self.stats.reset()
         self.update_statistics_display()
         
         # Show ultra-modern confirmation
-        confirm_window = tk.Toplevel(self.window)
-        confirm_window.title("Statistics Reset")
-        confirm_window.geometry("400x200")
-        confirm_window.configure(bg=self.colors['bg_secondary'])
-        confirm_window.resizable(False, False)
-        confirm_window.transient(self.window)
-        confirm_window.grab_set()
-        
-        # Center on parent
-        x = self.window.winfo_x() + (self.window.winfo_width() // 2) - 200
-        y = self.window.winfo_y() + (self.window.winfo_height() // 2) - 100
-        confirm_window.geometry(f"400x200+{x}+{y}")
-        
-        tk.Label(
-            confirm_window,
-            text="📊 Statistics Reset Complete!",
-            font=self.fonts['heading'],
-            fg=self.colors['text_primary'],
-            bg=self.colors['bg_secondary']
-        ).pack(pady=40)
-        
-        tk.Label(
-            confirm_window,
-            text="All game statistics have been cleared.",
-            font=self.fonts['body'],
-            fg=self.colors['text_secondary'],
-            bg=self.colors['bg_secondary']
-        ).pack(pady=(0, 20))
-        
-        tk.Button(
-            confirm_window,
-            text="✓ UNDERSTOOD",
-            font=self.fonts['button'],
-            bg=self.colors['success'],
-            fg=self.colors['text_primary'],
-            padx=25, pady=10,
-            command=confirm_window.destroy,
-            cursor='hand2',
-            relief='flat',
-            bd=0
-        ).pack()
+        if self.notice_overlay is None:
+            self.notice_overlay = NoticeOverlay(self)
+        self.notice_overlay.show(
+            "Statistics Reset",
+            "📊 Statistics Reset Complete!",
+            "All game statistics have been cleared."
+        )
     
     def run(self):
         """Run the ultra-modern game"""
         self.window.mainloop()
+        self.animator.stop()
+        self.cancel_ai()
+        self.engine.save_cache(wait=True)
+
+def measure_startup(runs, **options):
+    """Milliseconds from creating the game to its first drawn frame, one per run"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        game = UltraModernTicTacToe(**options)
+        game.window.update()
+        times.append((time.perf_counter() - start) * 1000)
+        game.window.destroy()
+    return times
 
 def main():
-    game = UltraModernTicTacToe()
+    parser = argparse.ArgumentParser(description="Ultra Modern Tic-Tac-Toe")
+    parser.add_argument(
+        '--instant-ai',
+        action='store_true',
+        help="play AI moves as soon as they are computed (no thinking delay)"
+    )
+    parser.add_argument(
+        '--min-think-ms',
+        type=int,
+        metavar='MS',
+        help="minimum time the AI appears to think, for every level "
+             "(default: 500 ms easy to 1500 ms hard)"
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help="don't read or write the on-disk AI cache"
+    )
+    parser.add_argument(
+        '--startup-benchmark',
+        type=int,
+        metavar='RUNS',
+        help="open and close the window RUNS times and report the startup time"
+    )
+    args = parser.parse_args()
+    options = {
+        'ai_pacing': 'instant' if args.instant_ai else 'paced',
+        'use_cache': not args.no_cache,
+        'ai_min_think_ms': args.min_think_ms
+    }
+    
+    if args.startup_benchmark:
+        times = sorted(measure_startup(args.startup_benchmark, **options))
+        print(f"Startup to first frame over {len(times)} runs: min {times[0]:.1f} ms, "
+              f"median {times[len(times) // 2]:.1f} ms, max {times[-1]:.1f} ms")
+        return
+    
+    game = UltraModernTicTacToe(**options)
     game.run()
 
 if __name__ == "__main__":